@@ -139,7 +139,7 @@ async def list_calendars(agent_id: int, _: AuthUser = _agent_auth, db: Session =
     
     access_token, updated_tokens = result
     if updated_tokens != tokens:
-        appointments.update_calendar_config(db, agent, {"google_tokens": updated_tokens})
+        appointments.update_calendar_config_path(db, agent, ("google_tokens",), updated_tokens)
     
     calendars = await calendar.list_calendars(access_token)
     return {"calendars": calendars}
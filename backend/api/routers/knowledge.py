@@ -67,7 +67,7 @@ async def upload_document(
     """Upload a document (PDF, DOCX). Super Admin only."""
     content = await file.read()
     try:
-        doc = documents.upload(db, agent_id, file.filename, content)
+        doc = await documents.upload(db, agent_id, file.filename, content)
         return {"id": doc.id, "filename": doc.filename, "chunks": doc.chunk_count}
     except ValueError as e:
         raise HTTPException(400, str(e))
@@ -172,7 +172,7 @@ async def upload_media(
         from backend.services.entities import ai
         from backend.services.media import document_extraction
         
-        extracted_text = document_extraction.extract_text(content, content_type)
+        extracted_text = await document_extraction.extract_text_cached(content, content_type)
         if extracted_text:
             analysis = await ai.analyze_document(extracted_text)
             
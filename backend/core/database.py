@@ -24,6 +24,7 @@ class Base(DeclarativeBase):
 
 def _init_extensions(conn):
     conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
+    conn.execute(text("CREATE EXTENSION IF NOT EXISTS btree_gist"))
     conn.execute(text("""
         DO $$
         BEGIN
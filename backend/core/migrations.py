@@ -12,6 +12,11 @@ def run_all(conn):
     _structural_improvements(conn)
     _cascade_and_jsonb(conn)
     _vector_indexes(conn)
+    _reminder_indexes(conn)
+    _appointment_indexes(conn)
+    _appointment_overlap_constraint(conn)
+    _message_indexes(conn)
+    _followup_indexes(conn)
     conn.commit()
 
 
@@ -147,6 +152,11 @@ def _indexes(conn):
         ON conversations (agent_id, created_at);
     """))
 
+    conn.execute(text("""
+        CREATE INDEX IF NOT EXISTS ix_agent_media_list
+        ON agent_media (agent_id, media_type, is_active, created_at DESC);
+    """))
+
 
 def _usage_and_pricing(conn):
     conn.execute(text("""
@@ -326,6 +336,12 @@ def _structural_improvements(conn):
         EXCEPTION WHEN duplicate_column THEN null;
         END $$;
     """))
+    conn.execute(text("""
+        DO $$ BEGIN
+            ALTER TABLE agent_media ADD COLUMN updated_at TIMESTAMP DEFAULT NOW();
+        EXCEPTION WHEN duplicate_column THEN null;
+        END $$;
+    """))
 
     # phone_number_id: allow NULL so non-Meta agents (e.g. WaSender) can be
     # created without colliding on the UNIQUE index when multiple have ''.
@@ -370,6 +386,14 @@ def _cascade_and_jsonb(conn):
             f"ALTER TABLE agents ALTER COLUMN {col} TYPE JSONB USING {col}::jsonb"
         ))
 
+    conn.execute(text(
+        "ALTER TABLE users ALTER COLUMN metadata TYPE JSONB USING metadata::jsonb"
+    ))
+    conn.execute(text("""
+        CREATE INDEX IF NOT EXISTS ix_users_metadata_gin
+        ON users USING gin (metadata jsonb_path_ops);
+    """))
+
 
 def _vector_indexes(conn):
     conn.execute(text("""
@@ -380,7 +404,104 @@ def _vector_indexes(conn):
         CREATE INDEX IF NOT EXISTS ix_data_rows_embedding_hnsw
         ON data_rows USING hnsw (embedding vector_cosine_ops);
     """))
+    # agent_media embeddings moved from vector to halfvec (requires pgvector >= 0.7).
+    # The old vector_cosine_ops index can't survive the type change, so drop it first.
+    conn.execute(text("""
+        DO $$ BEGIN
+            IF (
+                SELECT format_type(atttypid, atttypmod) FROM pg_attribute
+                WHERE attrelid = 'agent_media'::regclass AND attname = 'embedding'
+            ) <> 'halfvec(1536)' THEN
+                DROP INDEX IF EXISTS ix_agent_media_embedding_hnsw;
+                ALTER TABLE agent_media
+                    ALTER COLUMN embedding TYPE halfvec(1536) USING embedding::halfvec(1536);
+            END IF;
+        END $$;
+    """))
     conn.execute(text("""
         CREATE INDEX IF NOT EXISTS ix_agent_media_embedding_hnsw
-        ON agent_media USING hnsw (embedding vector_cosine_ops);
+        ON agent_media USING hnsw (embedding halfvec_cosine_ops);
+    """))
+
+
+def _reminder_indexes(conn):
+    conn.execute(text("""
+        CREATE INDEX IF NOT EXISTS ix_scheduled_reminders_due
+        ON scheduled_reminders (scheduled_for) WHERE status = 'pending';
+    """))
+    conn.execute(text("DROP INDEX IF EXISTS ix_scheduled_reminders_pending"))
+
+
+def _appointment_indexes(conn):
+    # Covers the busy-time and conflict lookups on live appointments (index-only scans)
+    conn.execute(text("""
+        CREATE INDEX IF NOT EXISTS ix_appointments_scheduled_busy
+        ON appointments (agent_id, start_time) INCLUDE (end_time)
+        WHERE status = 'scheduled';
+    """))
+    # NOT VALID: enforced for new/updated rows without scanning legacy data
+    conn.execute(text("""
+        DO $$ BEGIN
+            IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'ck_appointments_time_order') THEN
+                ALTER TABLE appointments ADD CONSTRAINT ck_appointments_time_order
+                CHECK (end_time > start_time) NOT VALID;
+            END IF;
+        END $$;
+    """))
+
+
+def _appointment_overlap_constraint(conn):
+    conn.execute(text("""
+        DO $$ BEGIN
+            ALTER TABLE appointments ADD COLUMN allow_overlap BOOLEAN NOT NULL DEFAULT FALSE;
+        EXCEPTION WHEN duplicate_column THEN null;
+        END $$;
+    """))
+    # The constraint is the only double-booking guard, so any failure below must
+    # stop startup. Legacy rows with inverted times would make tsrange() raise:
+    # swap them first (SET reads the old values). Then flag every appointment
+    # that overlaps an earlier one, which leaves the unflagged set overlap-free.
+    # Zero-length rows are never flagged: their empty range can't conflict, and
+    # updating them would trip the NOT VALID ck_appointments_time_order.
+    conn.execute(text("""
+        DO $$ BEGIN
+            IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'ex_appointments_no_overlap') THEN
+                UPDATE appointments SET start_time = end_time, end_time = start_time
+                WHERE end_time < start_time;
+                UPDATE appointments a SET allow_overlap = TRUE
+                WHERE a.status = 'scheduled' AND NOT a.allow_overlap
+                  AND a.end_time > a.start_time AND EXISTS (
+                    SELECT 1 FROM appointments b
+                    WHERE b.agent_id = a.agent_id AND b.status = 'scheduled'
+                      AND b.id < a.id
+                      AND b.start_time < a.end_time AND b.end_time > a.start_time
+                );
+                ALTER TABLE appointments ADD CONSTRAINT ex_appointments_no_overlap
+                EXCLUDE USING gist (agent_id WITH =, tsrange(start_time, end_time, '[)') WITH &&)
+                WHERE (status = 'scheduled' AND NOT allow_overlap);
+            END IF;
+        END $$;
+    """))
+
+
+def _message_indexes(conn):
+    # Context-summary queries read "messages after id X" per conversation, in id order
+    conn.execute(text("""
+        CREATE INDEX IF NOT EXISTS ix_messages_conv_id
+        ON messages (conversation_id, id);
+    """))
+
+
+def _followup_indexes(conn):
+    # Follow-up eligibility: SENT follow-ups per conversation by sent_at. Its
+    # leading column also serves the plain conversation_id lookups.
+    conn.execute(text("""
+        CREATE INDEX IF NOT EXISTS ix_followups_conv_status_sent
+        ON scheduled_followups (conversation_id, status, sent_at);
+    """))
+    conn.execute(text("DROP INDEX IF EXISTS ix_followups_conversation"))
+    # Pending-reminder check for an (agent, user) pair
+    conn.execute(text("""
+        CREATE INDEX IF NOT EXISTS ix_scheduled_reminders_agent_user_pending
+        ON scheduled_reminders (agent_id, user_id) WHERE status = 'pending';
     """))
@@ -0,0 +1,29 @@
+"""Shared async Redis connection for service-level caches and timers."""
+from time import monotonic
+from typing import Optional
+
+import redis.asyncio as aioredis
+
+from backend.core.config import settings
+
+# After a failed connect, callers get None without retrying until this passes,
+# so a Redis outage doesn't cost a connect+ping on every call
+_RETRY_AFTER_SECONDS = 30
+
+_redis_pool: Optional[aioredis.Redis] = None
+_retry_at = 0.0
+
+
+async def get_redis() -> Optional[aioredis.Redis]:
+    """Get the shared Redis connection pool, or None if Redis is unavailable."""
+    global _redis_pool, _retry_at
+    if _redis_pool is None and monotonic() >= _retry_at:
+        try:
+            _redis_pool = aioredis.from_url(
+                settings.redis_url, encoding="utf-8", decode_responses=True,
+            )
+            await _redis_pool.ping()
+        except Exception:
+            _redis_pool = None
+            _retry_at = monotonic() + _RETRY_AFTER_SECONDS
+    return _redis_pool
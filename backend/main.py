@@ -15,7 +15,9 @@ from backend.api.routers.export import router as export_router
 from backend.api.routers.webhook_meta import router as webhook_meta_router
 from backend.api.routers.agent_channels import router as agent_channels_router
 from backend.auth import auth_router
-from backend.services.scheduling import scheduler
+from backend.services.scheduling import scheduler, calendar, appointments
+from backend.services.knowledge import embeddings
+from backend.services.llm import anthropic as anthropic_llm
 
 
 @asynccontextmanager
@@ -33,6 +35,10 @@ async def lifespan(app: FastAPI):
     except asyncio.CancelledError:
         pass
 
+    embeddings.close_client()
+    await anthropic_llm.close_client()
+    await calendar.close_client()
+    await appointments.close_webhook_client()
     log("SERVER_DOWN")
 
 
@@ -120,6 +120,7 @@ class Agent(Base):
 
     conversations: Mapped[list["Conversation"]] = relationship(back_populates="agent", passive_deletes=True)
     appointments: Mapped[list["Appointment"]] = relationship(back_populates="agent", passive_deletes=True)
+    reminders: Mapped[list["ScheduledReminder"]] = relationship(back_populates="agent", passive_deletes=True)
     channels: Mapped[list["AgentChannel"]] = relationship("AgentChannel", back_populates="agent", passive_deletes=True)
     
     def get_batching_config(self) -> dict:
@@ -2,9 +2,9 @@
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import String, Text, Boolean, DateTime, Integer, ForeignKey, Index
+from sqlalchemy import String, Text, Boolean, DateTime, Integer, ForeignKey, Index, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from pgvector.sqlalchemy import Vector
+from pgvector.sqlalchemy import HALFVEC
 
 from backend.core.database import Base
 
@@ -75,12 +75,19 @@ class AgentMedia(Base):
     original_size: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     mime_type: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
     
-    # Semantic search
-    embedding: Mapped[Optional[list]] = mapped_column(Vector(EMBEDDING_DIM), nullable=True)
+    # Semantic search — fp16 (pgvector halfvec): half the bytes per row and
+    # per HNSW page, negligible recall loss for cosine search.
+    # Deferred: distance is computed server-side, CRUD never needs the vector.
+    embedding: Mapped[Optional[list]] = mapped_column(
+        HALFVEC(EMBEDDING_DIM), nullable=True, deferred=True
+    )
     
     # Status
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
+    )
     
     # Relationships
     agent: Mapped["Agent"] = relationship()
@@ -88,6 +95,11 @@ class AgentMedia(Base):
     __table_args__ = (
         Index("ix_agent_media_agent_type", "agent_id", "media_type"),
         Index("ix_agent_media_agent_active", "agent_id", "is_active"),
+        # get_by_agent: filter + ORDER BY created_at DESC in one index range scan
+        Index(
+            "ix_agent_media_list",
+            "agent_id", "media_type", "is_active", text("created_at DESC"),
+        ),
     )
     
     @property
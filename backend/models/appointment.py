@@ -1,6 +1,7 @@
 from datetime import datetime
 from typing import Optional
-from sqlalchemy import String, Text, DateTime, ForeignKey, Index
+from sqlalchemy import String, Text, Boolean, CheckConstraint, DateTime, ForeignKey, Index, column, func, literal_column, text
+from sqlalchemy.dialects.postgresql import ExcludeConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from backend.core.database import Base
 
@@ -27,6 +28,10 @@ class Appointment(Base):
     # Status: scheduled, cancelled, completed
     status: Mapped[str] = mapped_column(String(20), default="scheduled")
     
+    # Set when booked under allow_double_booking; exempts the row from the overlap constraint
+    # (bookings made with double-booking off still check against it in appointments._overlaps_exempt)
+    allow_overlap: Mapped[bool] = mapped_column(Boolean, default=False, server_default=text("false"))
+    
     # Timestamps
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -34,11 +39,26 @@ class Appointment(Base):
     # Relationships
     agent: Mapped["Agent"] = relationship(back_populates="appointments")
     user: Mapped["User"] = relationship(back_populates="appointments")
+    reminders: Mapped[list["ScheduledReminder"]] = relationship(back_populates="appointment", passive_deletes=True)
     
     __table_args__ = (
         Index("ix_appointments_agent_time", "agent_id", "start_time"),
+        Index(
+            "ix_appointments_scheduled_busy", "agent_id", "start_time",
+            postgresql_include=["end_time"],
+            postgresql_where=text("status = 'scheduled'"),
+        ),
         Index("ix_appointments_user", "user_id"),
         Index("ix_appointments_google_event", "google_event_id"),
+        CheckConstraint("end_time > start_time", name="ck_appointments_time_order"),
+        # No two live appointments of an agent may overlap (enforced by Postgres, race-free)
+        ExcludeConstraint(
+            ("agent_id", "="),
+            (func.tsrange(column("start_time"), column("end_time"), literal_column("'[)'")), "&&"),
+            name="ex_appointments_no_overlap",
+            using="gist",
+            where=text("status = 'scheduled' AND NOT allow_overlap"),
+        ),
     )
     
     @property
@@ -39,7 +39,7 @@ class ScheduledFollowup(Base):
 
     __table_args__ = (
         Index("ix_followups_pending", "status", "scheduled_for"),
-        Index("ix_followups_conversation", "conversation_id"),
+        Index("ix_followups_conv_status_sent", "conversation_id", "status", "sent_at"),
         Index("ix_followups_agent", "agent_id"),
         Index(
             "ix_followups_one_pending_per_conv",
@@ -1,7 +1,7 @@
 """Scheduled reminder model for appointment reminders."""
 from datetime import datetime
 from typing import Optional
-from sqlalchemy import String, Text, DateTime, Boolean, ForeignKey, Index
+from sqlalchemy import String, Text, DateTime, Boolean, ForeignKey, Index, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from backend.core.database import Base
 from backend.core.enums import ReminderStatus, ReminderContentType
@@ -52,13 +52,25 @@ class ScheduledReminder(Base):
     )
     
     # Relationships
-    appointment: Mapped["Appointment"] = relationship()
-    agent: Mapped["Agent"] = relationship()
-    user: Mapped["User"] = relationship()
+    appointment: Mapped["Appointment"] = relationship(back_populates="reminders")
+    agent: Mapped["Agent"] = relationship(back_populates="reminders")
+    user: Mapped["User"] = relationship(back_populates="reminders")
     
     __table_args__ = (
-        # Main query: find pending reminders that are due
-        Index("ix_scheduled_reminders_pending", "status", "scheduled_for"),
+        # Main query: find pending reminders that are due. Partial so the
+        # index only holds the small pending set, not the sent/cancelled history.
+        Index(
+            "ix_scheduled_reminders_due",
+            "scheduled_for",
+            postgresql_where=text("status = 'pending'"),
+        ),
         # Cleanup: find reminders by appointment
         Index("ix_scheduled_reminders_appointment", "appointment_id"),
+        # Follow-ups skip users with a pending reminder from the same agent
+        Index(
+            "ix_scheduled_reminders_agent_user_pending",
+            "agent_id",
+            "user_id",
+            postgresql_where=text("status = 'pending'"),
+        ),
     )
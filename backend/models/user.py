@@ -1,6 +1,7 @@
 from datetime import datetime
 from typing import Optional
-from sqlalchemy import String, DateTime, JSON, Enum
+from sqlalchemy import String, DateTime, Enum, Index
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from backend.core.database import Base
 import enum
@@ -19,9 +20,20 @@ class User(Base):
     phone: Mapped[str] = mapped_column(String(20), unique=True, index=True)
     name: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
     gender: Mapped[Gender] = mapped_column(Enum(Gender), default=Gender.UNKNOWN)
-    metadata_: Mapped[Optional[dict]] = mapped_column("metadata", JSON, nullable=True)
+    metadata_: Mapped[Optional[dict]] = mapped_column("metadata", JSONB, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     conversations: Mapped[list["Conversation"]] = relationship(back_populates="user")
     appointments: Mapped[list["Appointment"]] = relationship(back_populates="user")
+    reminders: Mapped[list["ScheduledReminder"]] = relationship(back_populates="user", passive_deletes=True)
+
+    __table_args__ = (
+        # Containment lookups: metadata @> '{"tier": "vip"}'
+        Index(
+            "ix_users_metadata_gin",
+            "metadata",
+            postgresql_using="gin",
+            postgresql_ops={"metadata": "jsonb_path_ops"},
+        ),
+    )
@@ -1,11 +1,10 @@
 """Build prompts for context summary generation."""
+from sqlalchemy import Row, func
 from sqlalchemy.orm import Session
 
 from backend.models.message import Message
 from backend.models.conversation_context_summary import ConversationContextSummary
 
-MAX_MESSAGES_FOR_FULL_SUMMARY = 200
-
 SUMMARY_INSTRUCTIONS = """סכם את השיחה בצורה מובנית ותמציתית. הסיכום ישמש כזיכרון ארוך טווח לסוכן AI.
 
 כלול:
@@ -20,6 +19,13 @@ SUMMARY_INSTRUCTIONS = """סכם את השיחה בצורה מובנית ותמ
 כתוב בעברית. היה ממוקד — אל תחזור על מידע כפול. אם אין מידע לסעיף מסוים, דלג עליו."""
 
 
+MAX_MESSAGE_CHARS = 500
+
+_ROLE_LABELS = {"user": "לקוח"}  # anything else is the agent
+
+CONSOLIDATE_INSTRUCTIONS = "כתוב סיכום מלא ומאוחד של השיחה: שלב את הסיכום הקיים עם ההודעות החדשות, אחד נושאים חוזרים והסר כפילויות ומידע שאינו רלוונטי עוד:"
+
+
 def should_do_full_summary(incremental_count: int, full_summary_every: int) -> bool:
     if full_summary_every <= 0:
         return False
@@ -31,23 +37,34 @@ def build_summary_prompt(
     conversation_id: int,
     summary: ConversationContextSummary | None,
     is_full: bool,
-) -> str:
-    if is_full:
-        return _build_full_prompt(db, conversation_id, summary)
-    return _build_incremental_prompt(db, conversation_id, summary)
+) -> tuple[str, int | None]:
+    """Return (prompt, id of the newest message the prompt covers).
+
+    Both modes send only the messages after last_message_id_covered. A full
+    cycle consolidates the existing summary instead of re-reading the whole
+    conversation.
+    """
+    return _build_incremental_prompt(db, conversation_id, summary, consolidate=is_full)
 
 
 def _build_incremental_prompt(
     db: Session,
     conversation_id: int,
     summary: ConversationContextSummary | None,
-) -> str:
+    consolidate: bool = False,
+) -> tuple[str, int | None]:
     last_id = summary.last_message_id_covered if summary else 0
 
-    new_messages = db.query(Message).filter(
+    # Only the columns the prompt uses; content is cut to MAX_MESSAGE_CHARS in SQL
+    new_messages = db.query(
+        Message.id,
+        Message.role,
+        Message.message_type,
+        func.substr(Message.content, 1, MAX_MESSAGE_CHARS).label("content"),
+    ).filter(
         Message.conversation_id == conversation_id,
         Message.id > last_id
-    ).order_by(Message.created_at).all()
+    ).order_by(Message.id).all()
 
     messages_text = _format_messages(new_messages)
 
@@ -61,47 +78,19 @@ def _build_incremental_prompt(
 
     parts.append(messages_text)
     parts.append("")
-    parts.append("כתוב סיכום מעודכן שמכסה את כל השיחה (כולל המידע מהסיכום הקיים אם רלוונטי):")
-    return "\n".join(parts)
-
-
-def _build_full_prompt(
-    db: Session,
-    conversation_id: int,
-    summary: ConversationContextSummary | None,
-) -> str:
-    all_messages = db.query(Message).filter(
-        Message.conversation_id == conversation_id
-    ).order_by(Message.created_at).limit(MAX_MESSAGES_FOR_FULL_SUMMARY).all()
-
-    messages_text = _format_messages(all_messages)
-
-    parts = [
-        SUMMARY_INSTRUCTIONS,
-        "",
-        f"כל ההודעות בשיחה ({len(all_messages)}):",
-        messages_text,
-        "",
-        "כתוב סיכום מלא של השיחה:",
-    ]
-    return "\n".join(parts)
-
-
-def get_last_message_id(
-    db: Session, conversation_id: int
-) -> int | None:
-    msg = db.query(Message.id).filter(
-        Message.conversation_id == conversation_id
-    ).order_by(Message.created_at.desc()).first()
-    return msg[0] if msg else None
-
-
-def _format_messages(msgs: list[Message]) -> str:
-    lines = []
-    for m in msgs:
-        role = "לקוח" if m.role == "user" else "סוכן"
-        mtype = m.message_type or "text"
-        prefix = f"[{mtype}] " if mtype != "text" else ""
-        content = (m.content or "")[:500]
-        lines.append(f"{role}: {prefix}{content}")
-    return "\n".join(lines)
+    if consolidate:
+        parts.append(CONSOLIDATE_INSTRUCTIONS)
+    else:
+        parts.append("כתוב סיכום מעודכן שמכסה את כל השיחה (כולל המידע מהסיכום הקיים אם רלוונטי):")
+    # Covered up to the newest message actually in the prompt, so messages
+    # arriving while the LLM runs are left for the next summary
+    return "\n".join(parts), max((m.id for m in new_messages), default=None)
+
+
+def _format_messages(msgs: list[Row]) -> str:
+    return "\n".join([
+        f"{_ROLE_LABELS.get(m.role, 'סוכן')}: "
+        f"{f'[{m.message_type}] ' if m.message_type and m.message_type != 'text' else ''}"
+        f"{(m.content or '')[:MAX_MESSAGE_CHARS]}"
+        for m in msgs
+    ])
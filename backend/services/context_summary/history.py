@@ -2,8 +2,8 @@
 from sqlalchemy.orm import Session
 
 from backend.models.message import Message
-from backend.models.conversation_context_summary import ConversationContextSummary
 from backend.services.context_summary.config import get_context_summary_config
+from backend.services.context_summary.store import get_summary
 
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:
@@ -18,12 +18,10 @@ def get_history_with_summary(
 ) -> list[dict] | None:
     """Build history using context summary if available.
 
-    Returns list[dict] in same format as messages.get_history,
-    or None if no summary exists (caller should fall back to normal history).
+    Returns bare {"role", "content"} dicts, as messages.get_history does with
+    include_meta=False, or None if no summary exists (caller should fall back to normal history).
     """
-    summary = db.query(ConversationContextSummary).filter(
-        ConversationContextSummary.conversation_id == conversation_id
-    ).first()
+    summary = get_summary(db, conversation_id)
 
     if not summary or not summary.summary_text:
         return None
@@ -42,20 +40,14 @@ def get_history_with_summary(
     if len(recent) > messages_after:
         recent = recent[-messages_after:]
 
-    updated_at_iso = summary.updated_at.isoformat() if summary.updated_at else None
-
     history = [
         {
             "role": "user",
             "content": f"[סיכום שיחה קודמת]:\n{summary.summary_text}",
-            "message_type": "text",
-            "created_at": updated_at_iso,
         },
         {
             "role": "assistant",
             "content": "קראתי את סיכום השיחה. אמשיך בהתאם.",
-            "message_type": "text",
-            "created_at": updated_at_iso,
         },
     ]
     history.extend(recent)
@@ -65,20 +57,12 @@ def get_history_with_summary(
 def _get_messages_after(
     db: Session, conversation_id: int, after_message_id: int, limit: int | None = None,
 ) -> list[dict]:
-    query = db.query(Message).filter(
+    query = db.query(Message.role, Message.content).filter(
         Message.conversation_id == conversation_id,
         Message.id > after_message_id,
-    ).order_by(Message.created_at, Message.id)
+    ).order_by(Message.id)
 
     if limit:
         query = query.limit(limit)
 
-    return [
-        {
-            "role": m.role,
-            "content": m.content,
-            "message_type": m.message_type or "text",
-            "created_at": m.created_at.isoformat() if m.created_at else None,
-        }
-        for m in query.all()
-    ]
+    return [{"role": m.role, "content": m.content} for m in query.all()]
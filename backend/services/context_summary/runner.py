@@ -6,10 +6,10 @@ from backend.models.conversation_context_summary import ConversationContextSumma
 from backend.services.entities import agents as agents_service
 from backend.services.llm import get_provider
 from backend.services.context_summary.config import get_context_summary_config
+from backend.services.context_summary.store import get_summary, invalidate_summary
 from backend.services.context_summary.builder import (
     should_do_full_summary,
     build_summary_prompt,
-    get_last_message_id,
 )
 from backend.core.logger import log, log_error
 
@@ -26,17 +26,14 @@ async def run_summary(db: Session, conversation_id: int, agent_id: int) -> None:
     if not config["enabled"]:
         return
 
-    summary = db.query(ConversationContextSummary).filter(
-        ConversationContextSummary.conversation_id == conversation_id
-    ).first()
+    summary = get_summary(db, conversation_id)
 
     is_full = should_do_full_summary(
         summary.incremental_count if summary else 0,
         config["full_summary_every"],
     )
 
-    prompt = build_summary_prompt(db, conversation_id, summary, is_full)
-    last_msg_id = get_last_message_id(db, conversation_id)
+    prompt, last_msg_id = build_summary_prompt(db, conversation_id, summary, is_full)
     if not last_msg_id:
         return
 
@@ -58,7 +55,7 @@ async def run_summary(db: Session, conversation_id: int, agent_id: int) -> None:
     _save_summary(db, conversation_id, summary, summary_text.strip(), last_msg_id, is_full)
 
     log("CONTEXT_SUMMARY", agent=agent.name, conv=conversation_id,
-        mode="full" if is_full else "incremental")
+        mode="consolidate" if is_full else "incremental")
 
 
 def _save_summary(
@@ -81,3 +78,4 @@ def _save_summary(
             incremental_count=1,
         ))
     db.commit()
+    invalidate_summary(db, conversation_id)
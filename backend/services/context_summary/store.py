@@ -0,0 +1,20 @@
+"""Per-session lookup of a conversation's context summary row."""
+from sqlalchemy.orm import Session
+
+from backend.models.conversation_context_summary import ConversationContextSummary
+
+_CACHE_KEY = "context_summaries"
+
+
+def get_summary(db: Session, conversation_id: int) -> ConversationContextSummary | None:
+    """Load the summary row once per session (history build and trigger check share it)."""
+    cache = db.info.setdefault(_CACHE_KEY, {})
+    if conversation_id not in cache:
+        cache[conversation_id] = db.query(ConversationContextSummary).filter(
+            ConversationContextSummary.conversation_id == conversation_id
+        ).first()
+    return cache[conversation_id]
+
+
+def invalidate_summary(db: Session, conversation_id: int) -> None:
+    db.info.get(_CACHE_KEY, {}).pop(conversation_id, None)
@@ -5,8 +5,9 @@ from sqlalchemy import func
 from backend.models.message import Message
 from backend.models.agent import Agent
 from backend.models.conversation_context_summary import ConversationContextSummary
-from backend.core.context_windows import get_safe_context_limit, estimate_tokens
+from backend.core.context_windows import get_safe_context_limit, estimate_tokens, CHARS_PER_TOKEN
 from backend.services.context_summary.config import get_context_summary_config
+from backend.services.context_summary.store import get_summary
 
 SYSTEM_PROMPT_TOKEN_BUFFER = 4000
 
@@ -16,40 +17,34 @@ def should_trigger_summary(db: Session, agent: Agent, conversation_id: int) -> b
     if not config["enabled"]:
         return False
 
-    summary = db.query(ConversationContextSummary).filter(
-        ConversationContextSummary.conversation_id == conversation_id
-    ).first()
+    summary = get_summary(db, conversation_id)
 
     last_covered_id = summary.last_message_id_covered if summary else 0
 
-    new_count = db.query(func.count(Message.id)).filter(
+    # Count and total length of the uncovered tail in one round trip
+    new_count, new_chars = db.query(
+        func.count(Message.id),
+        func.coalesce(func.sum(func.length(Message.content)), 0)
+    ).filter(
         Message.conversation_id == conversation_id,
         Message.id > last_covered_id
-    ).scalar() or 0
+    ).one()
 
     if new_count >= config["message_threshold"]:
         return True
 
-    return _approaching_context_limit(db, agent, conversation_id, summary, new_count)
+    return _approaching_context_limit(agent, summary, new_chars)
 
 
 def _approaching_context_limit(
-    db: Session,
     agent: Agent,
-    conversation_id: int,
     summary: ConversationContextSummary | None,
-    new_msg_count: int,
+    new_chars: int,
 ) -> bool:
     safe_limit = get_safe_context_limit(agent.model)
 
     summary_tokens = estimate_tokens(summary.summary_text) if summary else 0
-
-    recent_messages = db.query(Message.content).filter(
-        Message.conversation_id == conversation_id,
-        Message.id > (summary.last_message_id_covered if summary else 0)
-    ).all()
-
-    messages_tokens = sum(estimate_tokens(m.content or "") for m in recent_messages)
+    messages_tokens = new_chars // CHARS_PER_TOKEN
     total = summary_tokens + messages_tokens + SYSTEM_PROMPT_TOKEN_BUFFER
 
     return total >= safe_limit
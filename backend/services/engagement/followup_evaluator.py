@@ -5,8 +5,10 @@ Responsible for:
 - Calling the AI model for evaluation
 - Parsing AI JSON responses
 """
-import json
+import hashlib
 
+import orjson
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from backend.models.scheduled_followup import ScheduledFollowup
@@ -16,8 +18,12 @@ from backend.models.message import Message
 from backend.models.user import User
 from backend.services.llm import get_provider
 from backend.core.logger import log_error
+from backend.core.redis_client import get_redis
 from backend.core.enums import FollowupStatus
 
+# Seconds an identical prompt's decision is reused (see evaluate)
+DECISION_CACHE_TTL = 3600
+
 
 async def evaluate(
     db: Session, fu: ScheduledFollowup,
@@ -46,9 +52,22 @@ async def evaluate(
         )
 
     model = config.get("model", "claude-sonnet-4-6")
+
+    # Retries and duplicate timers rebuild the exact same prompt — reuse the answer.
+    # Template sends sit close to the 24h window, so they always get a fresh call.
+    cache_key = None
+    if config.get("cache_decisions", True) and not needs_template:
+        digest = hashlib.blake2b(f"{model}\0{prompt}".encode(), digest_size=16).hexdigest()
+        cache_key = f"fu:resp:{digest}"
+        cached = await _cache_get(cache_key)
+        if cached is not None:
+            return _parse_ai_decision(cached)
+
     try:
         provider = get_provider(model, agent=agent)
         response, usage = await provider.generate_tracked_response(prompt)
+        if cache_key:
+            await _cache_set(cache_key, response)
         from backend.services.entities.usage_tracking import record_usage
         record_usage(
             db, agent.id, model, "followup",
@@ -61,12 +80,41 @@ async def evaluate(
         return {"send": False, "reason": f"AI error: {str(e)[:100]}"}
 
 
+async def _cache_get(key: str) -> str | None:
+    r = await get_redis()
+    if not r:
+        return None
+    try:
+        return await r.get(key)
+    except Exception:
+        return None
+
+
+async def _cache_set(key: str, response: str) -> None:
+    r = await get_redis()
+    if not r:
+        return
+    try:
+        await r.set(key, response, ex=DECISION_CACHE_TTL)
+    except Exception:
+        pass
+
+
 # ──────────────────────────────────────────
 # Context builders
 # ──────────────────────────────────────────
 
+HISTORY_MESSAGE_CHARS = 200
+
+
 def _build_history_context(db: Session, conversation_id: int, limit: int = 20) -> str:
-    recent = db.query(Message).filter(
+    # Only the prompt columns; content is cut in SQL, one char past the limit
+    # so truncation is still detectable
+    recent = db.query(
+        Message.role,
+        Message.message_type,
+        func.substr(Message.content, 1, HISTORY_MESSAGE_CHARS + 1).label("content"),
+    ).filter(
         Message.conversation_id == conversation_id,
     ).order_by(Message.created_at.desc()).limit(limit).all()
 
@@ -79,7 +127,7 @@ def _build_history_context(db: Session, conversation_id: int, limit: int = 20) -
         mtype = msg.message_type or "text"
         prefix = f"[{mtype}] " if mtype != "text" else ""
         raw = msg.content or ""
-        content = raw[:200] + "..." if len(raw) > 200 else raw
+        content = raw[:HISTORY_MESSAGE_CHARS] + "..." if len(raw) > HISTORY_MESSAGE_CHARS else raw
         lines.append(f"{role}: {prefix}{content}")
 
     return "\n".join(lines)
@@ -115,6 +163,11 @@ def _get_personality(agent: Agent, max_chars: int = 500) -> str:
 # Prompt builders
 # ──────────────────────────────────────────
 
+# Both builders emit the per-agent part first (preamble, general instruction,
+# personality, templates, decision rules) and the per-conversation part last,
+# so consecutive evaluations for an agent share a byte-identical prompt prefix
+# that provider-side prefix caching can reuse.
+
 def _build_freetext_prompt(
     history: str, prev_followups: str, personality: str,
     step_number: int, total_steps: int, step_instruction: str | None,
@@ -124,22 +177,11 @@ def _build_freetext_prompt(
 
     parts = [
         "אתה סוכן מכירות שמחליט אם לשלוח הודעת follow-up ללקוח.",
-        "",
-        f"שם הלקוח: {customer_name}",
-        f"זה שלב {step_number} מתוך {total_steps} ברצף המעקב.",
     ]
 
     if general_instruction:
         parts.extend(["", f"הנחיות כלליות: {general_instruction}"])
 
-    if step_instruction:
-        parts.extend(["", f"הנחיית השלב: {step_instruction}"])
-
-    parts.extend(["", "היסטוריית השיחה:", history])
-
-    if prev_followups:
-        parts.extend(["", "הודעות follow-up קודמות שכבר שלחת:", prev_followups])
-
     if personality:
         parts.extend(["", "אישיות הסוכן:", personality])
 
@@ -155,6 +197,23 @@ def _build_freetext_prompt(
         '{"send": true/false, "content": "ההודעה אם send=true", "reason": "למה החלטת"}',
     ])
 
+    # Per-conversation context
+    parts.extend([
+        "",
+        f"שם הלקוח: {customer_name}",
+        f"זה שלב {step_number} מתוך {total_steps} ברצף המעקב.",
+    ])
+
+    if step_instruction:
+        parts.extend(["", f"הנחיית השלב: {step_instruction}"])
+
+    parts.extend(["", "היסטוריית השיחה:", history])
+
+    if prev_followups:
+        parts.extend(["", "הודעות follow-up קודמות שכבר שלחת:", prev_followups])
+
+    parts.extend(["", "החזר JSON בלבד."])
+
     return "\n".join(parts)
 
 
@@ -171,20 +230,11 @@ def _build_template_prompt(
 
     parts = [
         "אתה סוכן שמחליט אם לשלוח הודעת follow-up ללקוח דרך WhatsApp Template.",
-        f"זה שלב {step_number} מתוך {total_steps} ברצף המעקב.",
     ]
 
     if general_instruction:
         parts.extend(["", f"הנחיות כלליות: {general_instruction}"])
 
-    if step_instruction:
-        parts.extend(["", f"הנחיית השלב: {step_instruction}"])
-
-    parts.extend(["", "היסטוריית השיחה:", history])
-
-    if prev_followups:
-        parts.extend(["", "follow-ups קודמים:", prev_followups])
-
     parts.extend(["", "Templates זמינים:"])
     for t in templates_info:
         params_desc = ", ".join(
@@ -204,6 +254,19 @@ def _build_template_prompt(
         '{"send": true/false, "template_name": "שם", "template_language": "he", "template_params": ["ערך1", "ערך2"], "reason": "למה"}',
     ])
 
+    # Per-conversation context
+    parts.extend(["", f"זה שלב {step_number} מתוך {total_steps} ברצף המעקב."])
+
+    if step_instruction:
+        parts.extend(["", f"הנחיית השלב: {step_instruction}"])
+
+    parts.extend(["", "היסטוריית השיחה:", history])
+
+    if prev_followups:
+        parts.extend(["", "follow-ups קודמים:", prev_followups])
+
+    parts.extend(["", "החזר JSON בלבד."])
+
     return "\n".join(parts)
 
 
@@ -255,14 +318,14 @@ _TEMPLATE_PARAMS_RE = re.compile(r'"template_params"\s*:\s*\[(.*?)\]', re.DOTALL
 
 
 def _parse_ai_decision(response: str) -> dict:
-    """Parse AI JSON response. Tries json.loads first, falls back to regex extraction."""
+    """Parse AI JSON response. Tries orjson first, falls back to regex extraction."""
     text = _extract_json_block(response)
 
     try:
-        result = json.loads(text)
+        result = orjson.loads(text)
         if isinstance(result, dict):
             return result
-    except (json.JSONDecodeError, ValueError):
+    except orjson.JSONDecodeError:
         pass
 
     return _extract_via_regex(text)
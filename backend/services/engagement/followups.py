@@ -8,8 +8,8 @@ AI evaluation logic lives in followup_evaluator.py.
 from datetime import datetime, timedelta
 from typing import Optional
 
-import redis.asyncio as aioredis
-from sqlalchemy import func
+from sqlalchemy import Integer, and_, column, exists, func, or_, select, values
+from sqlalchemy import update as sql_update
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
@@ -23,7 +23,7 @@ from backend.models.user import User
 from backend.services.channels import providers
 from backend.services.messaging import messages
 from backend.services.engagement import followup_evaluator
-from backend.core.config import settings
+from backend.core.redis_client import get_redis
 from backend.core.logger import log, log_error
 from backend.core.enums import FollowupStatus, ReminderStatus
 
@@ -41,18 +41,29 @@ DEFAULT_CONFIG = {
     "active_hours": {"start": "09:00", "end": "21:00"},
     "meta_templates": [],
     "sequence": DEFAULT_SEQUENCE,
+    "cache_decisions": True,
 }
 
 
+# agent_id -> (agent.updated_at, merged config). Any agent update bumps updated_at.
+_config_cache: dict[int, tuple[Optional[datetime], dict]] = {}
+
+
 def get_config(agent: Agent) -> dict:
-    """Get follow-up config with defaults. Migrates old format automatically."""
-    import copy
-    config = copy.deepcopy(DEFAULT_CONFIG)
-    if agent.followup_config:
-        saved = agent.followup_config
-        config.update(saved)
-        if "sequence" not in saved and "intervals_minutes" in saved:
-            config["sequence"] = _migrate_old_config(saved)
+    """Get follow-up config with defaults. Migrates old format automatically.
+
+    Cached per agent and keyed on updated_at, so invalidation is implicit.
+    The returned dict is shared — callers must not mutate it.
+    """
+    cached = _config_cache.get(agent.id)
+    if cached and cached[0] == agent.updated_at:
+        return cached[1]
+
+    saved = agent.followup_config or {}
+    config = {**DEFAULT_CONFIG, **saved}
+    if "sequence" not in saved and "intervals_minutes" in saved:
+        config["sequence"] = _migrate_old_config(saved)
+    _config_cache[agent.id] = (agent.updated_at, config)
     return config
 
 
@@ -72,29 +83,13 @@ def _migrate_old_config(saved: dict) -> list[dict]:
 # Redis timer management
 # ──────────────────────────────────────────
 
-_redis_pool: Optional[aioredis.Redis] = None
-
-
-async def _get_redis() -> Optional[aioredis.Redis]:
-    global _redis_pool
-    if _redis_pool is None:
-        try:
-            _redis_pool = aioredis.from_url(
-                settings.redis_url, encoding="utf-8", decode_responses=True,
-            )
-            await _redis_pool.ping()
-        except Exception:
-            _redis_pool = None
-    return _redis_pool
-
-
 def _timer_key(agent_id: int, conv_id: int) -> str:
     return f"{agent_id}:{conv_id}"
 
 
 async def set_followup_timer(agent_id: int, conv_id: int, delay_hours: float) -> None:
     """Schedule a follow-up check after delay_hours."""
-    r = await _get_redis()
+    r = await get_redis()
     if not r:
         return
     fire_at = datetime.utcnow() + timedelta(hours=delay_hours)
@@ -106,7 +101,7 @@ async def set_followup_timer(agent_id: int, conv_id: int, delay_hours: float) ->
 
 async def cancel_followup_timer(agent_id: int, conv_id: int) -> None:
     """Cancel a pending follow-up timer."""
-    r = await _get_redis()
+    r = await get_redis()
     if not r:
         return
     try:
@@ -119,9 +114,20 @@ async def cancel_followup_timer(agent_id: int, conv_id: int) -> None:
 # Timer check: called by scheduler
 # ──────────────────────────────────────────
 
+# Claim up to ARGV[2] timers due by ARGV[1]: read and remove them in one atomic step,
+# so concurrent schedulers never process the same timer twice
+_CLAIM_TIMERS_LUA = """
+local due = redis.call('ZRANGEBYSCORE', KEYS[1], 0, ARGV[1], 'LIMIT', 0, ARGV[2])
+if #due > 0 then
+    redis.call('ZREM', KEYS[1], unpack(due))
+end
+return due
+"""
+
+
 async def check_followup_timers(db: Session) -> int:
     """Check Redis for matured timers, create followups for eligible ones."""
-    r = await _get_redis()
+    r = await get_redis()
     if not r:
         return 0
 
@@ -129,34 +135,23 @@ async def check_followup_timers(db: Session) -> int:
     created = 0
 
     try:
-        ready = await r.zrangebyscore(REDIS_KEY, 0, now.timestamp(), start=0, num=BATCH_SIZE)
+        # One round trip: matured timers are popped (claimed) atomically
+        claimed = await r.register_script(_CLAIM_TIMERS_LUA)(
+            keys=[REDIS_KEY], args=[now.timestamp(), BATCH_SIZE],
+        )
     except Exception as e:
-        log_error("followup_timer", f"ZRANGEBYSCORE failed: {str(e)[:50]}")
+        log_error("followup_timer", f"timer claim failed: {str(e)[:50]}")
         return 0
 
-    for key in ready:
-        claimed = await _claim_timer(r, key)
-        if not claimed:
-            continue
-        agent_id, conv_id = _parse_timer_key(key)
-        if not agent_id:
-            continue
-        if _create_if_eligible(db, agent_id, conv_id, now):
-            created += 1
+    timers = [t for t in map(_parse_timer_key, claimed) if t[0]]
+    if timers:
+        created = _create_eligible_followups(db, timers, now)
 
     if created:
         log("followup", msg=f"scheduled {created} follow-ups from timers")
     return created
 
 
-async def _claim_timer(r: aioredis.Redis, key: str) -> bool:
-    """Atomically remove timer to claim it (prevents duplicate processing)."""
-    try:
-        return bool(await r.zrem(REDIS_KEY, key))
-    except Exception:
-        return False
-
-
 def _parse_timer_key(key: str) -> tuple[int | None, int | None]:
     parts = key.split(":")
     if len(parts) != 2:
@@ -167,113 +162,115 @@ def _parse_timer_key(key: str) -> tuple[int | None, int | None]:
         return None, None
 
 
-def _create_if_eligible(db: Session, agent_id: int, conv_id: int, now: datetime) -> bool:
-    """Check eligibility and create a scheduled followup if conditions are met."""
-    agent = db.query(Agent).filter(Agent.id == agent_id, Agent.is_active == True).first()
-    if not agent:
-        return False
-
-    config = get_config(agent)
-    if not config["enabled"]:
-        return False
+def _create_eligible_followups(db: Session, timers: list[tuple[int, int]], now: datetime) -> int:
+    """Check eligibility for a batch of matured (agent_id, conv_id) timers and
+    create a scheduled followup for each one whose conditions are met.
 
-    conv = db.query(Conversation).filter(Conversation.id == conv_id).first()
-    if not conv or conv.opted_out or conv.is_paused:
-        return False
-
-    if not conv.last_customer_message_at:
-        return False
-
-    sequence = config.get("sequence", DEFAULT_SEQUENCE)
-    step = _get_current_step(db, conv, sequence)
-    if step is None:
-        return False
+    All eligibility facts come from one query (see _eligibility_rows); only
+    the inserts are per timer.
+    """
+    created = 0
+    for agent, conv, sent_since, message_count, has_pending_fu, has_pending_reminder in _eligibility_rows(db, timers):
+        config = get_config(agent)
+        if not config["enabled"]:
+            continue
 
-    # min_messages only applies to the first step (subsequent steps = sequence already committed)
-    if step == 0 and not _has_enough_messages(db, conv, config.get("min_messages", 5)):
-        return False
+        if conv.opted_out or conv.is_paused or not conv.last_customer_message_at:
+            continue
 
-    if _has_pending_followup(db, conv_id):
-        return False
+        # Which sequence step to schedule (0-indexed); exhausted when every step was sent
+        sequence = config.get("sequence", DEFAULT_SEQUENCE)
+        step = sent_since
+        if step >= len(sequence):
+            continue
 
-    if _has_pending_reminder(db, conv.user_id, agent_id):
-        return False
+        # min_messages only applies to the first step (subsequent steps = sequence already committed)
+        if step == 0 and message_count < config.get("min_messages", 5):
+            continue
 
-    return _schedule_followup(db, conv, agent, config, sequence, step, now)
+        if has_pending_fu or has_pending_reminder:
+            continue
 
+        if _schedule_followup(db, conv, agent, config, sequence, step, now):
+            created += 1
 
-def _get_current_step(db: Session, conv: Conversation, sequence: list[dict]) -> Optional[int]:
-    """Determine which sequence step to schedule (0-indexed). None if sequence exhausted."""
-    sent_since = db.query(func.count(ScheduledFollowup.id)).filter(
-        ScheduledFollowup.conversation_id == conv.id,
-        ScheduledFollowup.status == FollowupStatus.SENT,
-        ScheduledFollowup.sent_at > conv.last_customer_message_at,
-    ).scalar() or 0
-    if sent_since >= len(sequence):
-        return None
-    return sent_since
+    # One commit for the batch: committing per insert would expire every loaded
+    # agent and conversation and reload them row by row
+    db.commit()
+    return created
 
 
-def _has_enough_messages(db: Session, conv: Conversation, min_messages: int) -> bool:
-    """Check if enough messages were exchanged.
+def _eligibility_rows(db: Session, timers: list[tuple[int, int]]) -> list:
+    """One row per timer with an active agent and an existing conversation:
+    (agent, conv, sent_since, message_count, has_pending_fu, has_pending_reminder).
 
-    - No prior followups → count ALL messages in conversation.
-    - After a followup was sent → count messages since that followup.
+    - sent_since: followups sent since the customer's last message (= current step).
+    - message_count: messages since the last sent followup, or all messages if none.
     """
-    last_sent_fu = db.query(ScheduledFollowup.sent_at).filter(
-        ScheduledFollowup.conversation_id == conv.id,
-        ScheduledFollowup.status == FollowupStatus.SENT,
-    ).order_by(ScheduledFollowup.sent_at.desc()).first()
+    timer_values = values(
+        column("agent_id", Integer), column("conv_id", Integer), name="timers",
+    ).data(timers)
 
-    if last_sent_fu and last_sent_fu.sent_at:
-        count = db.query(func.count(Message.id)).filter(
-            Message.conversation_id == conv.id,
-            Message.created_at > last_sent_fu.sent_at,
-        ).scalar() or 0
-    else:
-        count = db.query(func.count(Message.id)).filter(
-            Message.conversation_id == conv.id,
-        ).scalar() or 0
+    last_sent_at = select(func.max(ScheduledFollowup.sent_at)).where(
+        ScheduledFollowup.conversation_id == Conversation.id,
+        ScheduledFollowup.status == FollowupStatus.SENT,
+    ).correlate(Conversation).scalar_subquery()
 
-    return count >= min_messages
+    sent_since = select(func.count(ScheduledFollowup.id)).where(
+        ScheduledFollowup.conversation_id == Conversation.id,
+        ScheduledFollowup.status == FollowupStatus.SENT,
+        ScheduledFollowup.sent_at > Conversation.last_customer_message_at,
+    ).scalar_subquery()
 
+    message_count = select(func.count(Message.id)).where(
+        Message.conversation_id == Conversation.id,
+        or_(last_sent_at.is_(None), Message.created_at > last_sent_at),
+    ).scalar_subquery()
 
-def _has_pending_followup(db: Session, conv_id: int) -> bool:
-    return db.query(ScheduledFollowup.id).filter(
-        ScheduledFollowup.conversation_id == conv_id,
+    has_pending_fu = exists().where(
+        ScheduledFollowup.conversation_id == Conversation.id,
         ScheduledFollowup.status.in_([FollowupStatus.PENDING, FollowupStatus.EVALUATING]),
-    ).first() is not None
-
+    )
 
-def _has_pending_reminder(db: Session, user_id: int, agent_id: int) -> bool:
-    return db.query(ScheduledReminder.id).filter(
-        ScheduledReminder.agent_id == agent_id,
-        ScheduledReminder.user_id == user_id,
+    has_pending_reminder = exists().where(
+        ScheduledReminder.agent_id == Agent.id,
+        ScheduledReminder.user_id == Conversation.user_id,
         ScheduledReminder.status == ReminderStatus.PENDING,
-    ).first() is not None
+    )
+
+    return db.query(
+        Agent, Conversation, sent_since, message_count, has_pending_fu, has_pending_reminder,
+    ).select_from(timer_values).join(
+        Agent, and_(Agent.id == timer_values.c.agent_id, Agent.is_active == True),
+    ).join(
+        Conversation, Conversation.id == timer_values.c.conv_id,
+    ).all()
 
 
 def _schedule_followup(
     db: Session, conv: Conversation, agent: Agent, config: dict,
     sequence: list[dict], step: int, now: datetime,
 ) -> bool:
-    """Create a scheduled follow-up record for the given step."""
+    """Create a scheduled follow-up record for the given step.
+
+    Inserted in a savepoint and left for the caller to commit, so a batch keeps
+    its loaded rows unexpired and a duplicate only rolls back its own insert.
+    """
     step_config = sequence[step]
     scheduled_for = _clamp_to_active_hours(now, config.get("active_hours", {}))
 
     try:
-        db.add(ScheduledFollowup(
-            conversation_id=conv.id,
-            agent_id=agent.id,
-            user_id=conv.user_id,
-            followup_number=step + 1,
-            step_instruction=step_config.get("instruction", ""),
-            scheduled_for=scheduled_for,
-        ))
-        db.commit()
+        with db.begin_nested():
+            db.add(ScheduledFollowup(
+                conversation_id=conv.id,
+                agent_id=agent.id,
+                user_id=conv.user_id,
+                followup_number=step + 1,
+                step_instruction=step_config.get("instruction", ""),
+                scheduled_for=scheduled_for,
+            ))
         return True
     except IntegrityError:
-        db.rollback()
         return False
 
 
@@ -329,30 +326,56 @@ async def process_pending_followups(db: Session) -> int:
     max_iterations = 20
 
     for _ in range(max_iterations):
-        pending = db.query(ScheduledFollowup).filter(
+        # Claim a batch in one UPDATE ... RETURNING. SKIP LOCKED lets
+        # concurrent schedulers take disjoint batches instead of waiting on
+        # each other; the status check is re-evaluated on the locked rows,
+        # so a row is claimed only once.
+        due = select(ScheduledFollowup.id).where(
             ScheduledFollowup.status == FollowupStatus.PENDING,
             ScheduledFollowup.scheduled_for <= now,
-        ).limit(BATCH_SIZE).all()
+        ).order_by(ScheduledFollowup.scheduled_for).limit(BATCH_SIZE).with_for_update(skip_locked=True)
+        pending = db.execute(
+            sql_update(ScheduledFollowup)
+            .where(
+                ScheduledFollowup.id.in_(due),
+                ScheduledFollowup.status == FollowupStatus.PENDING,
+            )
+            .values(status=FollowupStatus.EVALUATING)
+            .returning(ScheduledFollowup.id, ScheduledFollowup.agent_id, ScheduledFollowup.user_id)
+        ).all()
+        db.commit()
 
         if not pending:
             break
 
-        fu_ids = []
-        for fu in pending:
-            fu.status = FollowupStatus.EVALUATING
-            fu_ids.append(fu.id)
-        db.commit()
+        fu_ids = [fu.id for fu in pending]
+        agent_ids = {fu.agent_id for fu in pending}
+        user_ids = {fu.user_id for fu in pending}
+
+        # Agents and users for the whole batch in two IN queries; each task
+        # attaches them to its own session with merge(load=False), no SELECT
+        agents = {a.id: a for a in db.query(Agent).filter(Agent.id.in_(agent_ids))}
+        users = {u.id: u for u in db.query(User).filter(User.id.in_(user_ids))}
 
         async def _run(followup_id: int) -> bool:
             async with semaphore:
                 local_db = SessionLocal()
                 try:
-                    fu = local_db.query(ScheduledFollowup).filter(
-                        ScheduledFollowup.id == followup_id,
-                    ).first()
-                    if not fu:
+                    # Conversation is read fresh with the followup: its pause,
+                    # opt-out and last-message fields decide cancellation
+                    row = local_db.query(ScheduledFollowup, Conversation).outerjoin(
+                        Conversation, Conversation.id == ScheduledFollowup.conversation_id,
+                    ).filter(ScheduledFollowup.id == followup_id).first()
+                    if not row:
                         return False
-                    await _process_single(local_db, fu)
+                    fu, conv = row
+                    agent = agents.get(fu.agent_id)
+                    user = users.get(fu.user_id)
+                    await _process_single(
+                        local_db, fu, conv,
+                        local_db.merge(agent, load=False) if agent else None,
+                        local_db.merge(user, load=False) if user else None,
+                    )
                     local_db.commit()
                     return True
                 except Exception as e:
@@ -389,12 +412,14 @@ def _mark_failed(db: Session, followup_id: int, error: str) -> None:
         log_error("followup", f"failed to mark followup {followup_id} as skipped")
 
 
-async def _process_single(db: Session, fu: ScheduledFollowup) -> None:
+async def _process_single(
+    db: Session,
+    fu: ScheduledFollowup,
+    conv: Optional[Conversation],
+    agent: Optional[Agent],
+    user: Optional[User],
+) -> None:
     """Evaluate and potentially send a single follow-up."""
-    conv = db.query(Conversation).filter(Conversation.id == fu.conversation_id).first()
-    agent = db.query(Agent).filter(Agent.id == fu.agent_id).first()
-    user = db.query(User).filter(User.id == fu.user_id).first()
-
     if not conv or not agent or not user:
         _skip(fu, "missing conversation, agent, or user")
         return
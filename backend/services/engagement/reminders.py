@@ -4,6 +4,7 @@ Handles creating and sending scheduled reminders for appointments.
 """
 from datetime import datetime, timedelta
 
+from sqlalchemy import select, update as sql_update
 from sqlalchemy.orm import Session
 
 from backend.models.scheduled_reminder import ScheduledReminder
@@ -400,10 +401,8 @@ async def _send_meta_template(
 
 async def send_reminder(db: Session, reminder: ScheduledReminder) -> bool:
     """Send a reminder to the customer via WhatsApp."""
-    # Load related objects
-    appointment = db.query(Appointment).filter(
-        Appointment.id == reminder.appointment_id
-    ).first()
+    # Related objects are eager-loaded by process_pending_reminders
+    appointment = reminder.appointment
     
     if not appointment:
         _mark_failed(reminder, "appointment not found")
@@ -413,8 +412,8 @@ async def send_reminder(db: Session, reminder: ScheduledReminder) -> bool:
         reminder.status = ReminderStatus.CANCELLED
         return False
     
-    agent = db.query(Agent).filter(Agent.id == reminder.agent_id).first()
-    user = db.query(User).filter(User.id == reminder.user_id).first()
+    agent = reminder.agent
+    user = reminder.user
     
     if not agent or not user:
         _mark_failed(reminder, "agent or user not found")
@@ -462,9 +461,10 @@ def _mark_failed(reminder: ScheduledReminder, error: str) -> None:
 async def process_pending_reminders(db: Session) -> int:
     """Process pending reminders that are due.
     
-    Marks entire batch as PROCESSING before sending to prevent
-    duplicate sends in multi-instance deployments.
-    Uses joinedload to avoid N+1 queries on appointment/agent/user.
+    Claims each batch as PROCESSING (FOR UPDATE SKIP LOCKED, status re-checked)
+    before sending to prevent duplicate sends in multi-instance deployments.
+    The batch is loaded with joinedload *after* the claim commit, so the
+    eager-loaded appointment/agent/user are not expired by that commit.
     """
     import asyncio
     from sqlalchemy.orm import joinedload
@@ -473,6 +473,33 @@ async def process_pending_reminders(db: Session) -> int:
     processed = 0
     
     while True:
+        # Claim a batch in one UPDATE ... RETURNING. SKIP LOCKED keeps other
+        # instances off rows being claimed, and the status re-check on the
+        # locked rows means each reminder is claimed (and sent) only once.
+        due = (
+            select(ScheduledReminder.id)
+            .where(
+                ScheduledReminder.status == ReminderStatus.PENDING,
+                ScheduledReminder.scheduled_for <= now,
+            )
+            .order_by(ScheduledReminder.scheduled_for)
+            .limit(BATCH_SIZE)
+            .with_for_update(skip_locked=True)
+        )
+        batch_ids = db.execute(
+            sql_update(ScheduledReminder)
+            .where(
+                ScheduledReminder.id.in_(due),
+                ScheduledReminder.status == ReminderStatus.PENDING,
+            )
+            .values(status=ReminderStatus.PROCESSING)
+            .returning(ScheduledReminder.id)
+        ).scalars().all()
+        db.commit()
+        
+        if not batch_ids:
+            break
+        
         pending = (
             db.query(ScheduledReminder)
             .options(
@@ -480,22 +507,11 @@ async def process_pending_reminders(db: Session) -> int:
                 joinedload(ScheduledReminder.agent),
                 joinedload(ScheduledReminder.user),
             )
-            .filter(
-                ScheduledReminder.status == ReminderStatus.PENDING,
-                ScheduledReminder.scheduled_for <= now,
-            )
-            .limit(BATCH_SIZE)
+            .filter(ScheduledReminder.id.in_(batch_ids))
+            .order_by(ScheduledReminder.scheduled_for)
             .all()
         )
         
-        if not pending:
-            break
-        
-        # Mark entire batch as PROCESSING in one commit
-        for reminder in pending:
-            reminder.status = ReminderStatus.PROCESSING
-        db.commit()
-        
         for reminder in pending:
             try:
                 await send_reminder(db, reminder)
@@ -1,9 +1,9 @@
+from sqlalchemy import update as sql_update
 from sqlalchemy.orm import Session
-from sqlalchemy.orm.attributes import flag_modified
 from backend.models.agent import Agent
 
-_JSON_FIELDS = {"provider_config", "batching_config", "usage_stats", "calendar_config",
-                "summary_config", "followup_config", "media_config", "custom_api_keys"}
+# Resolved once from the mapper instead of a hasattr() probe per kwarg
+_COLUMNS = frozenset(Agent.__mapper__.columns.keys())
 
 
 def _normalize_phone_id(value: str | None) -> str | None:
@@ -61,18 +61,24 @@ def create(
 
 
 def update(db: Session, agent_id: int, **kwargs) -> Agent | None:
-    agent = get_by_id(db, agent_id)
-    if not agent:
-        return None
+    """Single UPDATE ... RETURNING instead of SELECT + flush + refresh.
+
+    JSON columns are written as whole values, so no flag_modified is needed
+    even when the caller mutated the existing dict in place.
+    """
     if "phone_number_id" in kwargs and kwargs["phone_number_id"] is not None:
         kwargs["phone_number_id"] = _normalize_phone_id(kwargs["phone_number_id"])
-    for key, value in kwargs.items():
-        if hasattr(agent, key) and value is not None:
-            setattr(agent, key, value)
-            if key in _JSON_FIELDS:
-                flag_modified(agent, key)
+    values = {k: v for k, v in kwargs.items() if k in _COLUMNS and v is not None}
+    if not values:
+        return get_by_id(db, agent_id)
+
+    agent = db.execute(
+        sql_update(Agent)
+        .where(Agent.id == agent_id)
+        .values(**values)
+        .returning(Agent)
+    ).scalar_one_or_none()
     db.commit()
-    db.refresh(agent)
     return agent
 
 
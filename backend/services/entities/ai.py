@@ -4,14 +4,20 @@ Supports:
 - Anthropic Claude (default, includes image understanding)
 - Google Gemini (text only, no image input)
 """
+import time
+from datetime import datetime
+from functools import lru_cache
 from typing import TYPE_CHECKING
+from zoneinfo import ZoneInfo
 
 from sqlalchemy.orm import Session
 
 from backend.core.logger import log_error
 from backend.core.ai_config import SYSTEM_SUFFIX
+from backend.core.timezone import get_tz
 from backend.services.llm import get_provider
 from backend.services.llm.types import LLMResponse
+from backend.services.media import agent_media
 
 if TYPE_CHECKING:
     from backend.services.messaging.buffer import PendingMessage
@@ -19,6 +25,44 @@ if TYPE_CHECKING:
 # Max media items to inject directly into prompt (above this, use search_media tool)
 MAX_MEDIA_IN_PROMPT = 15
 
+_PROMPT_TZ = get_tz("Asia/Jerusalem")
+# Indexed by datetime.weekday() (Monday first)
+_DAYS_HEBREW = ('שני', 'שלישי', 'רביעי', 'חמישי', 'שישי', 'שבת', 'ראשון')
+# working_hours keys are '0'..'6' starting Sunday
+_WORKING_HOURS_DAYS = (
+    ('0', 'ראשון'), ('1', 'שני'), ('2', 'שלישי'), ('3', 'רביעי'),
+    ('4', 'חמישי'), ('5', 'שישי'), ('6', 'שבת'),
+)
+
+
+@lru_cache(maxsize=1)
+def _date_str_for_minute(epoch_minute: int) -> str:
+    """Prompt date line; the text only changes once a minute, so build it once per minute."""
+    now = datetime.fromtimestamp(epoch_minute * 60, _PROMPT_TZ)
+    return f"היום: יום {_DAYS_HEBREW[now.weekday()]}, {now.strftime('%d/%m/%Y')}, שעה {now.strftime('%H:%M')}"
+
+
+_MEDIA_TYPE_LABELS = {"image": "תמונה", "video": "וידאו", "document": "קובץ"}
+
+
+def _format_media_line(m: dict) -> str:
+    """One prompt line per media item, built in a single f-string."""
+    caption = m['caption']
+    if not caption:
+        caption_hint = ""
+    elif len(caption) > 30:
+        caption_hint = f" (כיתוב: {caption[:30]}...)"
+    else:
+        caption_hint = f" (כיתוב: {caption})"
+    filename = m.get('filename')
+    description = m['description']
+    return (
+        f"• ID:{m['id']} [{_MEDIA_TYPE_LABELS.get(m['type'], m['type'])}] {m['name']}"
+        f"{f' [קובץ: {filename}]' if filename else ''}"
+        f"{f' - {description}' if description else ''}"
+        f"{caption_hint}"
+    )
+
 
 def build_media_context(db: Session, agent_id: int, media_config: dict | None) -> str:
     """Build media context for system prompt.
@@ -30,8 +74,6 @@ def build_media_context(db: Session, agent_id: int, media_config: dict | None) -
     if not media_config or not media_config.get("enabled"):
         return ""
     
-    from backend.services.media import agent_media
-    
     media_count = agent_media.count_by_agent(db, agent_id)
     
     if media_count == 0:
@@ -42,62 +84,114 @@ def build_media_context(db: Session, agent_id: int, media_config: dict | None) -
     if media_count <= MAX_MEDIA_IN_PROMPT:
         media_items = agent_media.get_media_for_prompt(db, agent_id)
         
-        media_lines = []
-        type_labels = {"image": "תמונה", "video": "וידאו", "document": "קובץ"}
-        for m in media_items:
-            type_label = type_labels.get(m['type'], m['type'])
-            desc = f" - {m['description']}" if m['description'] else ""
-            caption_hint = ""
-            if m['caption']:
-                caption_hint = f" (כיתוב: {m['caption'][:30]}...)" if len(m['caption']) > 30 else f" (כיתוב: {m['caption']})"
-            filename_hint = f" [קובץ: {m['filename']}]" if m.get('filename') else ""
-            media_lines.append(f"• ID:{m['id']} [{type_label}] {m['name']}{filename_hint}{desc}{caption_hint}")
-        
-        context = f"מדיה וקבצים זמינים לשליחה ({media_count} פריטים):\n" + "\n".join(media_lines)
-        context += "\n\nלשליחה השתמש בכלי send_media עם ה-ID המתאים."
+        parts = [
+            f"מדיה וקבצים זמינים לשליחה ({media_count} פריטים):\n",
+            "\n".join(_format_media_line(m) for m in media_items),
+            "\n\nלשליחה השתמש בכלי send_media עם ה-ID המתאים.",
+        ]
     else:
-        context = f"יש מאגר מדיה וקבצים עם {media_count} פריטים."
-        context += "\nלמציאת מדיה/קבצים רלוונטיים השתמש בכלי search_media עם תיאור מה שאתה מחפש."
-        context += "\nלאחר מכן השתמש ב-send_media עם ה-ID שנמצא."
+        parts = [
+            f"יש מאגר מדיה וקבצים עם {media_count} פריטים.",
+            "\nלמציאת מדיה/קבצים רלוונטיים השתמש בכלי search_media עם תיאור מה שאתה מחפש.",
+            "\nלאחר מכן השתמש ב-send_media עם ה-ID שנמצא.",
+        ]
     
     if custom_instructions:
-        context += f"\n\nהנחיות שימוש במדיה:\n{custom_instructions}"
+        parts.append(f"\n\nהנחיות שימוש במדיה:\n{custom_instructions}")
     
-    return context
+    return "".join(parts)
 
 
-def build_system_prompt(
-    base_prompt: str, 
-    user_info: dict, 
+_KNOWLEDGE_HEADER = "\n\n---\nמאגר מידע עסקי:\n"
+_SECTION_SEPARATOR = "\n\n---\n"
+_WORKING_HOURS_HEADER = "\n\n---\nשעות פעילות לתיאום פגישות:\n"
+_APPOINTMENT_PROMPT_HEADER = "\n\nהנחיות נוספות לתיאום פגישות:\n"
+
+
+def _working_hours_text(calendar_config: dict | None) -> str:
+    if not calendar_config or not calendar_config.get("google_tokens"):
+        return ""
+    working_hours = calendar_config.get("working_hours", {})
+    hours_text = []
+    for day_num, day_name in _WORKING_HOURS_DAYS:
+        hours = working_hours.get(day_num)
+        if hours:
+            hours_text.append(f"- {day_name}: {hours['start']}-{hours['end']}")
+        else:
+            hours_text.append(f"- {day_name}: סגור")
+    return "\n".join(hours_text)
+
+
+def build_agent_context(
+    base_prompt: str,
     knowledge_context: str = "",
-    media_context: str = ""
+    media_context: str = "",
+    calendar_config: dict | None = None,
+    appointment_prompt: str | None = None,
+) -> str:
+    """Build the agent-scoped system text — identical for every user of the agent."""
+    parts = [base_prompt, SYSTEM_SUFFIX]
+    if knowledge_context:
+        parts += (_KNOWLEDGE_HEADER, knowledge_context)
+    if media_context:
+        parts += (_SECTION_SEPARATOR, media_context)
+    hours_text = _working_hours_text(calendar_config)
+    if hours_text:
+        parts += (_WORKING_HOURS_HEADER, hours_text)
+    if appointment_prompt:
+        parts += (_APPOINTMENT_PROMPT_HEADER, appointment_prompt)
+    return "".join(parts)
+
+
+def build_appointments_context(user_appointments: list | None, calendar_config: dict | None) -> str:
+    """Build the per-user appointments text (empty when the user has none)."""
+    if not user_appointments:
+        return ""
+    
+    tz = ZoneInfo(calendar_config.get("timezone", "Asia/Jerusalem") if calendar_config else "Asia/Jerusalem")
+    apt_texts = []
+    for apt in user_appointments:
+        start_local = apt.start_time
+        if start_local.tzinfo is None:
+            start_local = start_local.replace(tzinfo=ZoneInfo("UTC"))
+        start_local = start_local.astimezone(tz)
+        apt_texts.append(f"- {apt.title}: {start_local.strftime('%d/%m/%Y')} בשעה {start_local.strftime('%H:%M')} (מזהה: {apt.id})")
+    
+    return "".join((
+        "---\nפגישות קיימות של המשתמש:\n",
+        "\n".join(apt_texts),
+        "\nאם המשתמש רוצה לשנות או לבטל פגישה קיימת, השתמש בכלי reschedule_appointment או cancel_appointment עם המזהה המתאים.",
+    ))
+
+
+def build_system_prompt(
+    agent_context: str,
+    user_info: dict,
+    user_context: str = ""
 ) -> list[dict]:
-    """Build system prompt blocks with caching."""
-    from datetime import datetime
-    from zoneinfo import ZoneInfo
+    """Build system prompt blocks with caching.
     
+    Blocks are ordered most-stable first so the cache breakpoint covers the
+    agent-scoped prefix: agent context (cached) -> date -> per-user context.
+    """
     blocks = []
-    tz = ZoneInfo("Asia/Jerusalem")
-    now = datetime.now(tz)
-    
-    days_hebrew = ['שני', 'שלישי', 'רביעי', 'חמישי', 'שישי', 'שבת', 'ראשון']
-    day_name = days_hebrew[now.weekday()]
-    date_str = f"היום: יום {day_name}, {now.strftime('%d/%m/%Y')}, שעה {now.strftime('%H:%M')}"
-    
-    # Block 1: Base prompt + knowledge + media (CACHED - stable per agent)
-    cached_content = f"{date_str}\n\n{base_prompt}{SYSTEM_SUFFIX}"
-    if knowledge_context:
-        cached_content += f"\n\n---\nמאגר מידע עסקי:\n{knowledge_context}"
-    if media_context:
-        cached_content += f"\n\n---\n{media_context}"
+    date_str = _date_str_for_minute(int(time.time()) // 60)
     
+    # Block 1: Agent context (CACHED - shared by all users of the agent).
+    # Must stay byte-identical across requests — nothing time- or user-dependent here.
     blocks.append({
         "type": "text",
-        "text": cached_content,
+        "text": agent_context,
         "cache_control": {"type": "ephemeral"}
     })
     
-    # Block 2: User info (NOT CACHED - changes per user)
+    # Block 2: Current date/time (NOT CACHED - changes every minute)
+    blocks.append({
+        "type": "text",
+        "text": date_str
+    })
+    
+    # Block 3: User appointments + info (NOT CACHED - changes per user)
     info_parts = []
     if user_info.get("name"):
         info_parts.append(f"שם: {user_info['name']}")
@@ -137,10 +231,16 @@ def build_system_prompt(
         if meta.get("notes"):
             info_parts.append(f"הערות: {meta['notes']}")
     
+    user_sections = []
+    if user_context:
+        user_sections.append(user_context)
     if info_parts:
+        user_sections.append("---\nמידע על המשתמש:\n" + "\n".join(info_parts))
+    
+    if user_sections:
         blocks.append({
             "type": "text",
-            "text": "---\nמידע על המשתמש:\n" + "\n".join(info_parts)
+            "text": "\n\n".join(user_sections)
         })
     
     return blocks
@@ -249,11 +349,14 @@ async def get_response(
     calendar_config: dict | None = None,
     user_appointments: list = None,
     agent=None,
+    has_images: bool | None = None,
 ) -> tuple[str, list[dict], dict, list[dict]]:
     """Get AI response with tool support.
     
     Automatically selects the appropriate provider based on model name.
     Forces Claude for image inputs (Gemini image support not implemented).
+    Callers that already know whether the batch holds images pass has_images
+    to skip rescanning pending_messages.
     
     Returns:
         tuple: (response_text, tool_calls, usage_data, media_actions)
@@ -261,7 +364,9 @@ async def get_response(
     """
     # Force Claude if input contains images
     actual_model = model
-    if _contains_images(pending_messages) and model.startswith("gemini"):
+    if has_images is None:
+        has_images = _contains_images(pending_messages)
+    if has_images and model.startswith("gemini"):
         actual_model = "claude-sonnet-4-6"  # Fallback to Claude for images
     
     # Build user content
@@ -270,41 +375,12 @@ async def get_response(
     else:
         user_content = user_message
     
-    # Build full system prompt with calendar context
-    full_prompt = system_prompt
-    if calendar_config and calendar_config.get("google_tokens"):
-        working_hours = calendar_config.get("working_hours", {})
-        days_hebrew = {'0': 'ראשון', '1': 'שני', '2': 'שלישי', '3': 'רביעי', '4': 'חמישי', '5': 'שישי', '6': 'שבת'}
-        hours_text = []
-        for day_num, day_name in days_hebrew.items():
-            hours = working_hours.get(day_num)
-            if hours:
-                hours_text.append(f"- {day_name}: {hours['start']}-{hours['end']}")
-            else:
-                hours_text.append(f"- {day_name}: סגור")
-        
-        full_prompt += f"\n\n---\nשעות פעילות לתיאום פגישות:\n" + "\n".join(hours_text)
-    
-    if appointment_prompt:
-        full_prompt += f"\n\nהנחיות נוספות לתיאום פגישות:\n{appointment_prompt}"
-    
-    # Add user's existing appointments to context
-    if user_appointments:
-        from zoneinfo import ZoneInfo
-        tz = ZoneInfo(calendar_config.get("timezone", "Asia/Jerusalem") if calendar_config else "Asia/Jerusalem")
-        apt_texts = []
-        for apt in user_appointments:
-            start_local = apt.start_time
-            if start_local.tzinfo is None:
-                start_local = start_local.replace(tzinfo=ZoneInfo("UTC"))
-            start_local = start_local.astimezone(tz)
-            apt_texts.append(f"- {apt.title}: {start_local.strftime('%d/%m/%Y')} בשעה {start_local.strftime('%H:%M')} (מזהה: {apt.id})")
-        
-        full_prompt += f"\n\n---\nפגישות קיימות של המשתמש:\n" + "\n".join(apt_texts)
-        full_prompt += "\nאם המשתמש רוצה לשנות או לבטל פגישה קיימת, השתמש בכלי reschedule_appointment או cancel_appointment עם המזהה המתאים."
-    
-    # Build system blocks (Anthropic format, converted by Gemini provider if needed)
-    system_blocks = build_system_prompt(full_prompt, user_info or {}, knowledge_context, media_context)
+    # Build system blocks (Anthropic format, converted by other providers if needed)
+    agent_context = build_agent_context(
+        system_prompt, knowledge_context, media_context, calendar_config, appointment_prompt
+    )
+    user_context = build_appointments_context(user_appointments, calendar_config)
+    system_blocks = build_system_prompt(agent_context, user_info or {}, user_context)
     
     provider = get_provider(actual_model, agent=agent)
     
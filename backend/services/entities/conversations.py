@@ -16,7 +16,6 @@ def get_or_create(db: Session, agent_id: int, user_id: int) -> Conversation:
         conv = Conversation(agent_id=agent_id, user_id=user_id)
         db.add(conv)
         db.commit()
-        db.refresh(conv)
 
     return conv
 
@@ -46,7 +45,6 @@ def set_paused(db: Session, conversation_id: int, paused: bool) -> Conversation
         return None
     conv.is_paused = paused
     db.commit()
-    db.refresh(conv)
     return conv
 
 
@@ -56,7 +54,6 @@ def set_opted_out(db: Session, conversation_id: int, opted_out: bool) -> Convers
         return None
     conv.opted_out = opted_out
     db.commit()
-    db.refresh(conv)
     return conv
 
 
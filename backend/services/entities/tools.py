@@ -1,4 +1,5 @@
 """Unified tool handler for AI tools."""
+import asyncio
 from datetime import datetime
 from zoneinfo import ZoneInfo
 from typing import Any
@@ -349,6 +350,67 @@ def _handle_search_media(db: Session, agent_id: int, data: dict) -> str:
 
 # ============ Main Handler ============
 
+# Tools that only read and spend their time awaiting external I/O; several of
+# them in one round are run concurrently. Everything else runs in call order
+# on the shared session.
+_CONCURRENT_TOOLS = frozenset({"check_availability"})
+
+
+async def _execute_tool(
+    db: Session,
+    agent: Agent,
+    user_id: int,
+    call: dict[str, Any],
+    config: dict,
+    tz: ZoneInfo,
+    conversation_id: int = None
+) -> Any:
+    """Dispatch a single tool call. Returns None for unknown tools."""
+    name = call["name"]
+    data = call["input"]
+    agent_id = agent.id
+    
+    # User tools
+    if name == "update_user_info":
+        return _handle_update_user_info(db, user_id, data)
+    
+    # Knowledge tools
+    if name == "search_knowledge":
+        return _handle_search_knowledge(db, agent_id, data)
+    
+    if name == "query_products":
+        return _handle_query_products(db, agent_id, data)
+    
+    # Appointment tools
+    if name == "check_availability":
+        return await _handle_check_availability(db, agent, data, config, tz)
+    
+    if name == "book_appointment":
+        return await _handle_book_appointment(db, agent, user_id, data, config, tz)
+    
+    if name == "get_my_appointments":
+        return _handle_get_my_appointments(db, agent_id, user_id, config.get("timezone", "Asia/Jerusalem"))
+    
+    if name == "cancel_appointment":
+        return await _handle_cancel_appointment(db, agent, user_id, data)
+    
+    if name == "reschedule_appointment":
+        return await _handle_reschedule_appointment(db, agent, user_id, data, tz)
+    
+    # Opt-out
+    if name == "opt_out_conversation":
+        return _handle_opt_out(db, conversation_id)
+    
+    # Media tools
+    if name == "send_media":
+        return _handle_send_media(db, agent_id, conversation_id, data, agent.media_config)
+    
+    if name == "search_media":
+        return _handle_search_media(db, agent_id, data)
+    
+    return None
+
+
 async def handle_tool_calls(
     db: Session, 
     agent: Agent, 
@@ -358,6 +420,9 @@ async def handle_tool_calls(
 ) -> list[dict[str, Any]]:
     """Handle all AI tool calls (knowledge, appointments, user info, media).
     
+    Independent I/O-bound lookups (see _CONCURRENT_TOOLS) are awaited together;
+    the rest run sequentially in the order the model issued them.
+    
     Args:
         db: Database session
         agent: Agent instance
@@ -366,58 +431,30 @@ async def handle_tool_calls(
         conversation_id: Conversation ID (needed for media duplicate check)
     
     Returns:
-        List of results, each with 'name' and 'result' keys.
+        List of results, each with 'tool_use_id', 'name' and 'result' keys.
+        Providers match results to calls by tool_use_id; unknown tools are omitted.
         For send_media, result is a dict with media details for actual sending.
     """
-    results = []
-    agent_id = agent.id
     config = appointments.get_calendar_config(agent)
     tz = ZoneInfo(config.get("timezone", "Asia/Jerusalem"))
     
+    concurrent = [c for c in tool_calls if c["name"] in _CONCURRENT_TOOLS]
+    prefetched = {}
+    if len(concurrent) > 1:
+        gathered = await asyncio.gather(*(
+            _execute_tool(db, agent, user_id, c, config, tz, conversation_id)
+            for c in concurrent
+        ))
+        prefetched = {c["id"]: r for c, r in zip(concurrent, gathered)}
+    
+    results = []
     for call in tool_calls:
-        name = call["name"]
-        data = call["input"]
-        result = None
-        
-        # User tools
-        if name == "update_user_info":
-            result = _handle_update_user_info(db, user_id, data)
-        
-        # Knowledge tools
-        elif name == "search_knowledge":
-            result = _handle_search_knowledge(db, agent_id, data)
-        
-        elif name == "query_products":
-            result = _handle_query_products(db, agent_id, data)
-        
-        # Appointment tools
-        elif name == "check_availability":
-            result = await _handle_check_availability(db, agent, data, config, tz)
-        
-        elif name == "book_appointment":
-            result = await _handle_book_appointment(db, agent, user_id, data, config, tz)
-        
-        elif name == "get_my_appointments":
-            result = _handle_get_my_appointments(db, agent_id, user_id, config.get("timezone", "Asia/Jerusalem"))
-        
-        elif name == "cancel_appointment":
-            result = await _handle_cancel_appointment(db, agent, user_id, data)
-        
-        elif name == "reschedule_appointment":
-            result = await _handle_reschedule_appointment(db, agent, user_id, data, tz)
-        
-        # Opt-out
-        elif name == "opt_out_conversation":
-            result = _handle_opt_out(db, conversation_id)
-        
-        # Media tools
-        elif name == "send_media":
-            result = _handle_send_media(db, agent_id, conversation_id, data, agent.media_config)
-        
-        elif name == "search_media":
-            result = _handle_search_media(db, agent_id, data)
+        if call["id"] in prefetched:
+            result = prefetched[call["id"]]
+        else:
+            result = await _execute_tool(db, agent, user_id, call, config, tz, conversation_id)
         
         if result is not None:
-            results.append({"name": name, "result": result})
+            results.append({"tool_use_id": call["id"], "name": call["name"], "result": result})
     
     return results
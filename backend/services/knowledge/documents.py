@@ -1,7 +1,11 @@
 """Document processing service - PDF, DOCX parsing and chunking."""
+import asyncio
 import io
+import re
+from bisect import bisect_right
+from collections import deque
 from sqlalchemy.orm import Session
-from sqlalchemy import select
+from sqlalchemy import insert, select, text
 
 from backend.models.knowledge import Document, DocumentChunk
 from backend.services.knowledge import embeddings
@@ -9,6 +13,7 @@ from backend.core.logger import log_upload
 
 CHUNK_SIZE = 1000
 CHUNK_OVERLAP = 200
+HNSW_EF_SEARCH = 100
 
 
 def _extract_text_pdf(content: bytes) -> str:
@@ -31,68 +36,112 @@ def _extract_text_docx(content: bytes) -> str:
     return "\n".join(p.text for p in doc.paragraphs if p.text.strip())
 
 
+_CHUNK_SEPARATORS = ["\n\n", "\n", ". ", "! ", "? "]  # preferred break points, best first
+
+
 def _chunk_text(text: str, chunk_size: int = CHUNK_SIZE, overlap: int = CHUNK_OVERLAP) -> list[str]:
     """Split text into overlapping chunks."""
     text = text.strip()
     if len(text) <= chunk_size:
         return [text] if text else []
     
+    # Every separator position, found in one pass per separator (lookahead keeps
+    # overlapping matches, as str.rfind would see them)
+    sep_positions = [
+        (sep, [m.start() for m in re.finditer(f"(?={re.escape(sep)})", text)])
+        for sep in _CHUNK_SEPARATORS
+    ]
+    
     chunks = []
     start = 0
     while start < len(text):
         end = start + chunk_size
-        chunk = text[start:end]
         
         # Try to break at sentence/paragraph boundary
         if end < len(text):
-            for sep in ["\n\n", "\n", ". ", "! ", "? "]:
-                last_sep = chunk.rfind(sep)
-                if last_sep > chunk_size // 2:
-                    chunk = chunk[:last_sep + len(sep)]
-                    end = start + len(chunk)
+            for sep, positions in sep_positions:
+                # Last occurrence lying entirely inside text[start:end]
+                i = bisect_right(positions, end - len(sep)) - 1
+                if i >= 0 and positions[i] - start > chunk_size // 2:
+                    end = positions[i] + len(sep)
                     break
         
-        chunks.append(chunk.strip())
+        chunks.append(text[start:end].strip())
         start = end - overlap
     
     return [c for c in chunks if c]
 
 
-def upload(db: Session, agent_id: int, filename: str, content: bytes) -> Document:
-    """Upload and process a document."""
+async def upload(db: Session, agent_id: int, filename: str, content: bytes) -> Document:
+    """Upload and process a document.
+    
+    Parsing runs in a worker thread, and up to EMBEDDING_MAX_WORKERS embedding
+    batches are in flight at once, starting before the Document row is flushed. Each batch is inserted as soon as it (and the
+    ones before it) is embedded, so the DB writes overlap the remaining API
+    calls and memory stays bounded by the window, not the document.
+    """
     ext = filename.rsplit(".", 1)[-1].lower()
     
     if ext == "pdf":
-        text = _extract_text_pdf(content)
+        extract = _extract_text_pdf
     elif ext in ("docx", "doc"):
-        text = _extract_text_docx(content)
+        extract = _extract_text_docx
     else:
         raise ValueError(f"Unsupported file type: {ext}")
     
+    text = await asyncio.to_thread(extract, content)
     chunks = _chunk_text(text)
     if not chunks:
         raise ValueError("No text content found in document")
     
-    chunk_embeddings = embeddings.get_embeddings_batch(chunks)
-    
-    doc = Document(
-        agent_id=agent_id,
-        filename=filename,
-        file_type=ext,
-        file_size=len(content),
-        chunk_count=len(chunks)
-    )
-    db.add(doc)
-    db.flush()
-    
-    for i, (chunk_text, chunk_emb) in enumerate(zip(chunks, chunk_embeddings)):
-        chunk = DocumentChunk(
-            document_id=doc.id,
-            content=chunk_text,
-            chunk_index=i,
-            embedding=chunk_emb
+    step = embeddings.EMBEDDING_BATCH_SIZE
+    batch_starts = iter(range(0, len(chunks), step))
+    embed_tasks: deque[tuple[int, asyncio.Task]] = deque()
+    
+    def submit_next() -> None:
+        k = next(batch_starts, None)
+        if k is not None:
+            batch = chunks[k:k + step]
+            embed_tasks.append((k, asyncio.create_task(
+                asyncio.to_thread(embeddings.get_embeddings_batch, batch)
+            )))
+    
+    for _ in range(embeddings.EMBEDDING_MAX_WORKERS):
+        submit_next()
+    # Yield once so the tasks hand their batches to the executor before the
+    # blocking Document flush below; otherwise nothing starts until the first await
+    await asyncio.sleep(0)
+    
+    try:
+        doc = Document(
+            agent_id=agent_id,
+            filename=filename,
+            file_type=ext,
+            file_size=len(content),
+            chunk_count=len(chunks)
         )
-        db.add(chunk)
+        db.add(doc)
+        db.flush()
+        
+        while embed_tasks:
+            k, task = embed_tasks.popleft()
+            chunk_embeddings = await task
+            submit_next()
+            # One executemany (batched multi-row INSERTs) per embedding batch
+            db.execute(insert(DocumentChunk), [
+                {
+                    "document_id": doc.id,
+                    "content": chunk_text,
+                    "chunk_index": k + i,
+                    "embedding": chunk_emb,
+                }
+                for i, (chunk_text, chunk_emb) in enumerate(zip(chunks[k:k + step], chunk_embeddings))
+            ])
+    except BaseException:
+        for _, task in embed_tasks:
+            task.cancel()
+        db.rollback()
+        raise
     
     db.commit()
     db.refresh(doc)
@@ -123,6 +172,10 @@ def search(db: Session, agent_id: int, query: str, limit: int = 5) -> list[dict]
     """Semantic search across document chunks."""
     query_embedding = embeddings.get_embedding(query)
     
+    # ix_doc_chunks_embedding_hnsw is shared by all agents and the agent filter
+    # is applied after the index scan, so widen the candidate list (default 40)
+    # to keep `limit` results for agents with a small share of the chunks.
+    db.execute(text(f"SET LOCAL hnsw.ef_search = {HNSW_EF_SEARCH}"))
     results = db.execute(
         select(DocumentChunk, Document)
         .join(Document)
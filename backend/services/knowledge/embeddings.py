@@ -1,4 +1,6 @@
 """Embeddings service using OpenAI text-embedding-3-small."""
+import httpx
+from concurrent.futures import ThreadPoolExecutor
 from openai import OpenAI
 from backend.core.config import settings
 
@@ -7,16 +9,35 @@ _client: OpenAI | None = None
 EMBEDDING_MODEL = "text-embedding-3-small"
 EMBEDDING_DIM = 1536
 
+# Inputs per embeddings request (API max is 2048) and concurrent requests per call
+EMBEDDING_BATCH_SIZE = 256
+EMBEDDING_MAX_WORKERS = 8
+
+# Shared keep-alive pool: uploads embed in bursts, skip a TLS handshake per call
+_HTTP_LIMITS = httpx.Limits(max_connections=32, max_keepalive_connections=16)
+_HTTP_TIMEOUT = httpx.Timeout(30.0, connect=10.0)
+
 
 def _get_client() -> OpenAI:
     global _client
     if _client is None:
         if not settings.openai_api_key:
             raise ValueError("OPENAI_API_KEY not configured")
-        _client = OpenAI(api_key=settings.openai_api_key)
+        _client = OpenAI(
+            api_key=settings.openai_api_key,
+            http_client=httpx.Client(limits=_HTTP_LIMITS, timeout=_HTTP_TIMEOUT),
+        )
     return _client
 
 
+def close_client() -> None:
+    """Close the pooled HTTP client (called on app shutdown)."""
+    global _client
+    if _client is not None:
+        _client.close()
+        _client = None
+
+
 def get_embedding(text: str) -> list[float]:
     """Get embedding vector for a single text."""
     client = _get_client()
@@ -32,23 +53,34 @@ def get_embedding(text: str) -> list[float]:
     return response.data[0].embedding
 
 
+def _embed_inputs(inputs: list[str]) -> list[list[float]]:
+    response = _get_client().embeddings.create(model=EMBEDDING_MODEL, input=inputs)
+    return [d.embedding for d in response.data]
+
+
 def get_embeddings_batch(texts: list[str]) -> list[list[float]]:
-    """Get embeddings for multiple texts in one API call."""
-    client = _get_client()
+    """Get embeddings for multiple texts.
     
+    Inputs are split into sub-batches (the API caps inputs and tokens per
+    request) that are sent concurrently; result order matches `texts`.
+    """
     cleaned = [t.replace("\n", " ").strip() for t in texts]
     non_empty = [(i, t) for i, t in enumerate(cleaned) if t]
     
     if not non_empty:
         return [[0.0] * EMBEDDING_DIM for _ in texts]
     
-    response = client.embeddings.create(
-        model=EMBEDDING_MODEL,
-        input=[t for _, t in non_empty]
-    )
+    inputs = [t for _, t in non_empty]
+    batches = [inputs[k:k + EMBEDDING_BATCH_SIZE] for k in range(0, len(inputs), EMBEDDING_BATCH_SIZE)]
+    if len(batches) == 1:
+        vectors = _embed_inputs(batches[0])
+    else:
+        _get_client()  # create the shared client once, before the worker threads
+        with ThreadPoolExecutor(max_workers=min(EMBEDDING_MAX_WORKERS, len(batches))) as pool:
+            vectors = [v for batch in pool.map(_embed_inputs, batches) for v in batch]
     
     result = [[0.0] * EMBEDDING_DIM for _ in texts]
-    for j, (i, _) in enumerate(non_empty):
-        result[i] = response.data[j].embedding
+    for (i, _), vector in zip(non_empty, vectors):
+        result[i] = vector
     
     return result
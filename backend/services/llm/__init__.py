@@ -3,6 +3,7 @@
 Provides unified access to different LLM providers (Anthropic, Google, OpenAI).
 Uses key_manager for multi-key pool and per-agent override support.
 """
+from functools import lru_cache
 from typing import TYPE_CHECKING
 
 from backend.core.logger import log
@@ -15,7 +16,9 @@ if TYPE_CHECKING:
 _providers: dict = {}
 
 
+@lru_cache(maxsize=64)
 def _resolve_provider_name(model: str) -> str:
+    """Map a model name to its provider (memoized — agents reuse a handful of models)."""
     if model.startswith(("gpt-", "o1-", "o3-")):
         return "openai"
     if model.startswith("gemini"):
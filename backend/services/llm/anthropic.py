@@ -1,6 +1,9 @@
 """Anthropic (Claude) provider implementation."""
 import anthropic
 import asyncio
+import json
+import re
+import httpx
 from typing import TYPE_CHECKING
 
 from .types import LLMResponse, ToolHandler
@@ -15,18 +18,72 @@ if TYPE_CHECKING:
 MAX_RETRIES = 3
 RETRY_DELAY = 1.0
 
+_EPHEMERAL = {"type": "ephemeral"}
+
+
+def _with_cache_breakpoint(message: dict) -> dict:
+    """Copy of message with cache_control on its last content block.
+    
+    Anthropic caches the whole prefix up to a marked block, so marking the
+    tail of the conversation lets the next request (or tool round) read
+    history from cache. Never mutates the caller's message.
+    """
+    content = message["content"]
+    if isinstance(content, str):
+        if not content:
+            return message
+        blocks = [{"type": "text", "text": content}]
+    else:
+        blocks = list(content)
+        if not blocks or not isinstance(blocks[-1], dict):
+            return message
+    blocks[-1] = {**blocks[-1], "cache_control": _EPHEMERAL}
+    return {**message, "content": blocks}
+
+
+_FENCE_RE = re.compile(r"^```(?:json)?\s*(.*?)\s*```$", re.DOTALL)
+
+
+def _parse_json_reply(text: str) -> dict:
+    """Parse a JSON reply, tolerating a ```json fence around it."""
+    text = text.strip()
+    match = _FENCE_RE.match(text)
+    return json.loads(match.group(1) if match else text)
+
+
+# One connection pool shared by every provider instance, so key rotation and
+# per-key providers reuse warm connections under concurrent conversations.
+_HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50, keepalive_expiry=30)
+_HTTP_TIMEOUT = httpx.Timeout(60.0, connect=5.0)
+_http_client: httpx.AsyncClient | None = None
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(limits=_HTTP_LIMITS, timeout=_HTTP_TIMEOUT)
+    return _http_client
+
+
+async def close_client() -> None:
+    """Close the shared HTTP pool (called on app shutdown)."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
 
 class AnthropicProvider:
     """Claude API provider with tool support and caching."""
     
     def __init__(self, api_key: str, provider_name: str = "anthropic", agent: "Agent | None" = None):
-        self._client = anthropic.AsyncAnthropic(api_key=api_key)
+        self._client = anthropic.AsyncAnthropic(api_key=api_key, http_client=_get_http_client())
         self._api_key = api_key
         self._provider_name = provider_name
         self._agent = agent
 
     def _rebuild_client(self, new_key: str):
-        self._client = anthropic.AsyncAnthropic(api_key=new_key)
+        self._client = anthropic.AsyncAnthropic(api_key=new_key, http_client=_get_http_client())
         self._api_key = new_key
 
     async def _call_with_retry(self, **kwargs):
@@ -121,14 +178,19 @@ class AnthropicProvider:
         Returns:
             LLMResponse with text, tool_calls, usage, media_actions
         """
-        clean_history = [{"role": m["role"], "content": m["content"]} for m in history]
-        messages = clean_history + [{"role": "user", "content": user_content}]
+        # History arrives as bare {"role", "content"} dicts (get_history with
+        # include_meta=False, get_history_with_summary) and is forwarded as-is
+        messages = list(history)
+        # Breakpoint budget (max 4): system block + end of history + rolling tail
+        if messages:
+            messages[-1] = _with_cache_breakpoint(messages[-1])
+        messages.append({"role": "user", "content": user_content})
         
         response = await self._call_with_retry(
             model=model,
             max_tokens=4096,
             system=system_blocks,
-            messages=messages,
+            messages=messages[:-1] + [_with_cache_breakpoint(messages[-1])],
             tools=USER_TOOLS,
             extra_headers={"anthropic-beta": "prompt-caching-2024-07-31"}
         )
@@ -176,9 +238,10 @@ class AnthropicProvider:
             else:
                 tool_results_data = tool_handler(current_tool_calls)
             
+            results_by_id = {r["tool_use_id"]: r for r in tool_results_data}
             tool_results = []
-            for i, call in enumerate(current_tool_calls):
-                result_data = tool_results_data[i] if i < len(tool_results_data) else None
+            for call in current_tool_calls:
+                result_data = results_by_id.get(call["id"])
                 if not result_data:
                     result = "לא נמצא"
                 elif isinstance(result_data.get("result"), dict) and result_data["result"].get("action") == "send_media":
@@ -195,11 +258,13 @@ class AnthropicProvider:
             
             messages.append({"role": "user", "content": tool_results})
             
+            # Rolling breakpoint on the newest tool results: rounds 2+ read the
+            # previous rounds from cache instead of paying for them again
             current_response = await self._call_with_retry(
                 model=model,
                 max_tokens=4096,
                 system=system_blocks,
-                messages=messages,
+                messages=messages[:-1] + [_with_cache_breakpoint(messages[-1])],
                 tools=USER_TOOLS,
                 extra_headers={"anthropic-beta": "prompt-caching-2024-07-31"}
             )
@@ -300,14 +365,7 @@ class AnthropicProvider:
             
             for block in response.content:
                 if block.type == "text":
-                    import json
-                    text = block.text.strip()
-                    if text.startswith("```"):
-                        text = text.split("```")[1]
-                        if text.startswith("json"):
-                            text = text[4:]
-                        text = text.strip()
-                    return json.loads(text)
+                    return _parse_json_reply(block.text)
             
             return {"name": "תמונה", "description": "", "caption": ""}
         except Exception:
@@ -343,14 +401,7 @@ class AnthropicProvider:
             
             for block in response.content:
                 if block.type == "text":
-                    import json
-                    text = block.text.strip()
-                    if text.startswith("```"):
-                        text = text.split("```")[1]
-                        if text.startswith("json"):
-                            text = text[4:]
-                        text = text.strip()
-                    return json.loads(text)
+                    return _parse_json_reply(block.text)
             
             return {"name": "קובץ", "description": "", "caption": ""}
         except Exception:
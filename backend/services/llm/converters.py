@@ -8,6 +8,8 @@ Anthropic and Gemini use slightly different formats for:
 
 This module provides conversion functions to translate between formats.
 """
+from uuid import uuid4
+
 from google.genai import types
 
 
@@ -110,9 +112,12 @@ def gemini_function_call_to_standard(fc) -> dict:
     
     Standard format used internally:
         {"id": ..., "name": ..., "input": {...}}
+
+    Gemini may omit call ids; a unique fallback keeps results matchable by
+    id when the same function is called twice in one round.
     """
     return {
-        "id": getattr(fc, 'id', None) or fc.name,
+        "id": getattr(fc, 'id', None) or f"{fc.name}:{uuid4().hex[:8]}",
         "name": fc.name,
         "input": dict(fc.args) if fc.args else {}
     }
@@ -208,10 +208,12 @@ class GeminiProvider:
             else:
                 tool_results_data = tool_handler(tool_calls)
             
+            results_by_id = {r["tool_use_id"]: r for r in tool_results_data}
+
             # Build function responses
             response_parts = []
-            for i, call in enumerate(tool_calls):
-                result_data = tool_results_data[i] if i < len(tool_results_data) else None
+            for call in tool_calls:
+                result_data = results_by_id.get(call["id"])
                 if not result_data:
                     result = "לא נמצא"
                 elif isinstance(result_data.get("result"), dict) and result_data["result"].get("action") == "send_media":
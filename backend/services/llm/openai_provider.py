@@ -193,9 +193,11 @@ class OpenAIProvider:
             else:
                 results = tool_handler(tool_calls)
             
+            results_by_id = {r["tool_use_id"]: r for r in results}
+
             # Add tool results
-            for i, tc in enumerate(tool_calls):
-                result_data = results[i] if i < len(results) else None
+            for tc in tool_calls:
+                result_data = results_by_id.get(tc["id"])
                 if not result_data:
                     result = "לא נמצא"
                 elif isinstance(result_data.get("result"), dict) and result_data["result"].get("action") == "send_media":
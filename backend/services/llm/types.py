@@ -20,5 +20,6 @@ class LLMResponse:
 
 
 # Type alias for tool handler function
-# Takes list of tool calls, returns list of results
+# Takes list of tool calls ({id, name, input}), returns list of results
+# ({tool_use_id, name, result}) matched back to calls by tool_use_id
 ToolHandler = Callable[[list[dict]], Awaitable[list[dict]]]
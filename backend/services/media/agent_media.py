@@ -3,9 +3,10 @@
 Manages images/videos/documents that agents can send during conversations.
 """
 import logging
+from functools import lru_cache
 from typing import BinaryIO
 
-from sqlalchemy import select
+from sqlalchemy import delete as sql_delete, func, select
 from sqlalchemy.orm import Session
 
 from backend.models.agent_media import (
@@ -19,18 +20,21 @@ from backend.services.media import storage
 logger = logging.getLogger(__name__)
 
 
+# media_type -> (allowed MIME types, max size in bytes); built once at import
+_VALIDATORS: dict[str, tuple[frozenset[str], int]] = {
+    "image": (frozenset(ALLOWED_IMAGE_TYPES), MAX_IMAGE_SIZE),
+    "video": (frozenset(ALLOWED_VIDEO_TYPES), MAX_VIDEO_SIZE),
+    "document": (frozenset(ALLOWED_DOCUMENT_TYPES), MAX_DOCUMENT_SIZE),
+}
+
+
 def _validate_file(content_type: str, file_size: int, media_type: str) -> None:
     """Validate file type and size based on media type."""
-    validators = {
-        "image": (ALLOWED_IMAGE_TYPES, MAX_IMAGE_SIZE),
-        "video": (ALLOWED_VIDEO_TYPES, MAX_VIDEO_SIZE),
-        "document": (ALLOWED_DOCUMENT_TYPES, MAX_DOCUMENT_SIZE),
-    }
-    
-    if media_type not in validators:
+    validator = _VALIDATORS.get(media_type)
+    if validator is None:
         raise ValueError(f"Invalid media type: {media_type}")
     
-    allowed_types, max_size = validators[media_type]
+    allowed_types, max_size = validator
     
     if content_type not in allowed_types:
         raise ValueError(f"Invalid {media_type} type: {content_type}")
@@ -40,6 +44,12 @@ def _validate_file(content_type: str, file_size: int, media_type: str) -> None:
         raise ValueError(f"{media_type.title()} too large. Max: {max_mb}MB")
 
 
+@lru_cache(maxsize=512)
+def _cached_embedding(text: str) -> tuple[float, ...]:
+    """Embedding per distinct text — common names ("price list") repeat across uploads."""
+    return tuple(embeddings.get_embedding(text))
+
+
 def _generate_embedding(name: str, description: str | None) -> list[float] | None:
     """Generate embedding from name + description."""
     text = name
@@ -49,7 +59,7 @@ def _generate_embedding(name: str, description: str | None) -> list[float] | Non
     if len(text) < 3:
         return None
     
-    return embeddings.get_embedding(text)
+    return list(_cached_embedding(text))
 
 
 def upload(
@@ -108,11 +118,13 @@ def upload(
         is_active=True
     )
     
+    # Flush for the id (INSERT ... RETURNING) so the log line reads it before the
+    # commit expires the instance. Callers reading attributes after the commit
+    # reload the row once (the embedding stays deferred), as the old refresh did.
     db.add(media)
-    db.commit()
-    db.refresh(media)
-    
+    db.flush()
     logger.info(f"media upload agent={agent_id} id={media.id} type={media_type}")
+    db.commit()
     return media
 
 
@@ -154,13 +166,14 @@ def update(
     if not media:
         return None
     
+    # Only re-embed when the searchable text actually changes
     update_embedding = False
     
-    if name is not None:
+    if name is not None and name != media.name:
         media.name = name
         update_embedding = True
     
-    if description is not None:
+    if description is not None and description != media.description:
         media.description = description
         update_embedding = True
     
@@ -176,8 +189,8 @@ def update(
     if update_embedding:
         media.embedding = _generate_embedding(media.name, media.description)
     
+    # Attributes read after the commit reload the row once (embedding deferred)
     db.commit()
-    db.refresh(media)
     return media
 
 
@@ -198,6 +211,29 @@ def delete(db: Session, media_id: int) -> bool:
     return True
 
 
+def bulk_delete(db: Session, media_ids: list[int]) -> int:
+    """Delete many media items: one SELECT, batched R2 deletes, one DELETE.
+    
+    For agent offboarding / retention cleanup. Returns number of rows deleted.
+    """
+    if not media_ids:
+        return 0
+    
+    rows = db.execute(
+        select(AgentMedia.id, AgentMedia.file_key).where(AgentMedia.id.in_(media_ids))
+    ).all()
+    if not rows:
+        return 0
+    
+    storage.delete_files([r.file_key for r in rows])
+    
+    db.execute(sql_delete(AgentMedia).where(AgentMedia.id.in_([r.id for r in rows])))
+    db.commit()
+    
+    logger.info(f"media bulk_delete count={len(rows)}")
+    return len(rows)
+
+
 def search(db: Session, agent_id: int, query: str, limit: int = 5) -> list[AgentMedia]:
     """Semantic search for media items."""
     query_embedding = embeddings.get_embedding(query)
@@ -216,13 +252,41 @@ def search(db: Session, agent_id: int, query: str, limit: int = 5) -> list[Agent
     return list(results)
 
 
+# agent_id -> (version, prompt items). One entry per agent; replaced on version change.
+_prompt_cache: dict[int, tuple[tuple, list[dict]]] = {}
+
+
+def _media_version(db: Session, agent_id: int) -> tuple:
+    """Cheap change probe: any upload, edit, (de)activation or delete moves it."""
+    row = db.execute(
+        select(func.count(), func.max(AgentMedia.updated_at))
+        .where(AgentMedia.agent_id == agent_id)
+    ).one()
+    return tuple(row)
+
+
 def get_media_for_prompt(db: Session, agent_id: int) -> list[dict]:
     """Get media list for injecting into system prompt.
     
     Returns simplified list for AI context.
     Used when agent has <= 15 media items.
+    Cached per agent and keyed on _media_version, so invalidation is implicit.
+    The returned list is shared — callers must not mutate it.
     """
-    media_items = get_by_agent(db, agent_id, active_only=True)
+    version = _media_version(db, agent_id)
+    cached = _prompt_cache.get(agent_id)
+    if cached and cached[0] == version:
+        return cached[1]
+    
+    # Only the prompt columns — never hydrate full rows (embedding) on this path
+    media_items = db.execute(
+        select(
+            AgentMedia.id, AgentMedia.media_type, AgentMedia.name,
+            AgentMedia.description, AgentMedia.default_caption, AgentMedia.filename,
+        )
+        .where(AgentMedia.agent_id == agent_id, AgentMedia.is_active == True)
+        .order_by(AgentMedia.created_at.desc())
+    )
     
     result = []
     for m in media_items:
@@ -237,12 +301,21 @@ def get_media_for_prompt(db: Session, agent_id: int) -> list[dict]:
             item["filename"] = m.filename
         result.append(item)
     
+    _prompt_cache[agent_id] = (version, result)
     return result
 
 
 def count_by_agent(db: Session, agent_id: int) -> int:
-    """Count active media items for an agent."""
-    return db.query(AgentMedia).filter(
-        AgentMedia.agent_id == agent_id,
-        AgentMedia.is_active == True
-    ).count()
+    """Count active media items for an agent.
+
+    Flat SELECT count(*) (Query.count() wraps the query in a subquery),
+    answered from ix_agent_media_agent_active.
+    """
+    return db.scalar(
+        select(func.count())
+        .select_from(AgentMedia)
+        .where(
+            AgentMedia.agent_id == agent_id,
+            AgentMedia.is_active == True
+        )
+    )
@@ -1,9 +1,20 @@
 """Document text extraction for various file formats."""
+import asyncio
+import codecs
+import hashlib
 from io import BytesIO
 
+from backend.core.redis_client import get_redis
+
 # Max characters to extract (enough for AI analysis, not too expensive)
 MAX_EXTRACT_CHARS = 5000
 
+# Extracted text is a pure function of the file, so re-uploads reuse it
+_EXTRACT_CACHE_TTL = 7 * 24 * 3600
+
+# Plain text bytes decoded before cleaning; leaves room for blank lines and indentation
+MAX_TXT_DECODE_BYTES = 64 * 1024
+
 
 def extract_text(content: bytes, mime_type: str) -> str:
     """Extract text from document based on MIME type.
@@ -32,6 +43,32 @@ def extract_text(content: bytes, mime_type: str) -> str:
         return ""
 
 
+async def extract_text_cached(content: bytes, mime_type: str) -> str:
+    """extract_text behind a Redis cache keyed by sha256 of the file.
+    
+    On a miss, extraction runs in a worker thread so parsing never blocks the event loop.
+    """
+    key = f"extract:{mime_type}:{hashlib.sha256(content).hexdigest()}"
+    r = await get_redis()
+    if r:
+        try:
+            cached = await r.get(key)
+            if cached is not None:
+                return cached
+        except Exception:
+            pass
+    
+    text = await asyncio.to_thread(extract_text, content, mime_type)
+    
+    # Empty means unsupported or failed - not worth caching
+    if r and text:
+        try:
+            await r.set(key, text, ex=_EXTRACT_CACHE_TTL)
+        except Exception:
+            pass
+    return text
+
+
 def _clean_text(text: str) -> str:
     """Clean extracted text - remove excessive whitespace."""
     lines = [line.strip() for line in text.split("\n") if line.strip()]
@@ -44,10 +81,13 @@ def _extract_pdf(content: bytes) -> str:
     
     doc = fitz.open(stream=content, filetype="pdf")
     texts = []
+    total_len = 0
     
     for page in doc:
-        texts.append(page.get_text())
-        if len("\n".join(texts)) > MAX_EXTRACT_CHARS:
+        text = page.get_text()
+        texts.append(text)
+        total_len += len(text) + 1
+        if total_len > MAX_EXTRACT_CHARS:
             break
     
     doc.close()
@@ -60,11 +100,13 @@ def _extract_docx(content: bytes) -> str:
     
     doc = Document(BytesIO(content))
     texts = []
+    total_len = 0
     
     for para in doc.paragraphs:
         if para.text.strip():
             texts.append(para.text)
-        if len("\n".join(texts)) > MAX_EXTRACT_CHARS:
+            total_len += len(para.text) + 1
+        if total_len > MAX_EXTRACT_CHARS:
             break
     
     return "\n".join(texts)
@@ -76,17 +118,22 @@ def _extract_xlsx(content: bytes) -> str:
     
     wb = load_workbook(BytesIO(content), read_only=True, data_only=True)
     texts = []
+    total_len = 0
     
     for sheet in wb.sheetnames[:3]:  # Max 3 sheets
         ws = wb[sheet]
         texts.append(f"[{sheet}]")
+        total_len += len(sheet) + 3
         
-        for row in ws.iter_rows(max_row=50, values_only=True):
+        for row in ws.iter_rows(max_row=50, max_col=20, values_only=True):
             row_text = " | ".join(str(cell) for cell in row if cell is not None)
             if row_text:
                 texts.append(row_text)
+                total_len += len(row_text) + 1
+                if total_len > MAX_EXTRACT_CHARS:
+                    break
         
-        if len("\n".join(texts)) > MAX_EXTRACT_CHARS:
+        if total_len > MAX_EXTRACT_CHARS:
             break
     
     wb.close()
@@ -99,6 +146,7 @@ def _extract_pptx(content: bytes) -> str:
     
     prs = Presentation(BytesIO(content))
     texts = []
+    total_len = 0
     
     for i, slide in enumerate(prs.slides[:20], 1):  # Max 20 slides
         slide_texts = []
@@ -108,30 +156,49 @@ def _extract_pptx(content: bytes) -> str:
         
         if slide_texts:
             texts.append(f"[Slide {i}] " + " ".join(slide_texts))
+            total_len += len(texts[-1]) + 1
         
-        if len("\n".join(texts)) > MAX_EXTRACT_CHARS:
+        if total_len > MAX_EXTRACT_CHARS:
             break
     
     return "\n".join(texts)
 
 
 def _extract_txt(content: bytes) -> str:
-    """Extract text from plain text file."""
+    """Extract text from plain text file.
+    
+    Only a bounded prefix is decoded - the result is cut to MAX_EXTRACT_CHARS
+    anyway - so a failed trial encoding never rescans a large file.
+    """
+    prefix = content[:MAX_TXT_DECODE_BYTES]
     for encoding in ["utf-8", "cp1255", "iso-8859-8", "latin-1"]:
         try:
-            return content.decode(encoding)
+            # Incremental decode tolerates a multi-byte char split by the cut
+            return codecs.getincrementaldecoder(encoding)().decode(prefix, final=False)
         except UnicodeDecodeError:
             continue
     return ""
 
 
+class _PrintableTable(dict):
+    """str.translate table keeping printable chars plus newline and tab, filled per code point on first sight."""
+    
+    def __missing__(self, cp: int) -> int | None:
+        c = chr(cp)
+        self[cp] = cp if c.isprintable() or c in "\n\t" else None
+        return self[cp]
+
+
+_PRINTABLE_FILTER = _PrintableTable()
+
+
 def _extract_doc_fallback(content: bytes) -> str:
     """Fallback for old .doc format - limited support."""
     # Old .doc format is binary, best effort extraction
     try:
         text = content.decode("utf-8", errors="ignore")
-        # Filter printable characters
-        return "".join(c for c in text if c.isprintable() or c in "\n\t")
+        # Filter printable characters (str.translate scans in C)
+        return text.translate(_PRINTABLE_FILTER)
     except Exception:
         return ""
 
@@ -151,6 +151,39 @@ def delete_file(file_key: str) -> bool:
         return False
 
 
+# S3 DeleteObjects accepts at most 1000 keys per request
+_DELETE_BATCH_SIZE = 1000
+
+
+def delete_files(file_keys: list[str]) -> int:
+    """Delete many files from R2 with batched DeleteObjects calls.
+    
+    Args:
+        file_keys: Paths in bucket
+    
+    Returns:
+        Number of keys R2 reported as deleted
+    """
+    client = _get_client()
+    deleted = 0
+    
+    for start in range(0, len(file_keys), _DELETE_BATCH_SIZE):
+        batch = file_keys[start:start + _DELETE_BATCH_SIZE]
+        try:
+            resp = client.delete_objects(
+                Bucket=settings.r2_bucket_name,
+                Delete={"Objects": [{"Key": k} for k in batch], "Quiet": False}
+            )
+            deleted += len(resp.get("Deleted", []))
+            for err in resp.get("Errors", []):
+                logger.error(f"storage delete_failed key={err.get('Key')} error={err.get('Code')}")
+        except ClientError as e:
+            logger.error(f"storage bulk_delete_failed count={len(batch)} error={e}")
+    
+    logger.info(f"storage bulk_delete_success count={deleted}")
+    return deleted
+
+
 def file_exists(file_key: str) -> bool:
     """Check if file exists in R2."""
     client = _get_client()
@@ -237,5 +270,4 @@ async def cache_profile_pic(source_url: str, channel_user_id: int) -> Optional[s
 
 def delete_profile_pic(channel_user_id: int) -> None:
     """Delete cached profile pictures for a channel user (GDPR)."""
-    for ext in ("jpg", "png"):
-        delete_file(f"profile_pics/{channel_user_id}.{ext}")
+    delete_files([f"profile_pics/{channel_user_id}.{ext}" for ext in ("jpg", "png")])
@@ -58,7 +58,14 @@ def add_no_commit(
     return msg
 
 
-def get_history(db: Session, conversation_id: int, limit: int | None = None) -> list[dict]:
+def get_history(
+    db: Session, conversation_id: int, limit: int | None = None, include_meta: bool = True
+) -> list[dict]:
+    """Conversation messages oldest first.
+
+    include_meta=False returns bare {"role", "content"} dicts, the shape LLM
+    providers forward as-is.
+    """
     query = db.query(Message).filter(
         Message.conversation_id == conversation_id
     )
@@ -69,6 +76,9 @@ def get_history(db: Session, conversation_id: int, limit: int | None = None) ->
     else:
         msgs = query.order_by(Message.created_at, Message.id).all()
 
+    if not include_meta:
+        return [{"role": m.role, "content": m.content} for m in msgs]
+
     return [
         {
             "role": m.role,
@@ -1,4 +1,5 @@
 """Shared message processing logic for all webhook handlers."""
+import asyncio
 from datetime import datetime, timedelta
 from typing import Callable, Awaitable, Optional
 
@@ -180,23 +181,26 @@ async def process_batched_messages(
             log("PAUSED", agent=agent.name, user=display_name, msgs=len(pending_msgs))
             return
         
-        has_images = False
+        # Describe all images/videos in the batch concurrently
+        media_msgs = [
+            msg for msg in pending_msgs
+            if msg.msg_type in ("image", "video") and msg.image_base64
+        ]
+        has_images = bool(media_msgs)
+        has_image_blocks = any(msg.msg_type == "image" for msg in media_msgs)  # sent to the model as content blocks
         describe_usage_total = {"input_tokens": 0, "output_tokens": 0}
-        for msg in pending_msgs:
-            content_to_save = msg.text
-
-            if msg.msg_type in ("image", "video") and msg.image_base64:
-                has_images = True
-                description, desc_usage = await ai.describe_image(
-                    msg.image_base64, msg.media_type or "image/jpeg", agent=agent,
-                )
-                describe_usage_total["input_tokens"] += desc_usage.get("input_tokens", 0)
-                describe_usage_total["output_tokens"] += desc_usage.get("output_tokens", 0)
-                prefix = "[תמונה]" if msg.msg_type == "image" else "[וידאו]"
-                content_to_save = f"{prefix}: {description}"
-                msg.text = content_to_save
+        descriptions = await asyncio.gather(*(
+            ai.describe_image(msg.image_base64, msg.media_type or "image/jpeg", agent=agent)
+            for msg in media_msgs
+        ))
+        for msg, (description, desc_usage) in zip(media_msgs, descriptions):
+            describe_usage_total["input_tokens"] += desc_usage.get("input_tokens", 0)
+            describe_usage_total["output_tokens"] += desc_usage.get("output_tokens", 0)
+            prefix = "[תמונה]" if msg.msg_type == "image" else "[וידאו]"
+            msg.text = f"{prefix}: {description}"
 
-            messages.add_no_commit(db, conv.id, "user", content_to_save, message_type=msg.msg_type)
+        for msg in pending_msgs:
+            messages.add_no_commit(db, conv.id, "user", msg.text, message_type=msg.msg_type)
         db.commit()
 
         combined_text = "\n".join(msg.text for msg in pending_msgs)
@@ -207,7 +211,7 @@ async def process_batched_messages(
         fetch_limit = max_history + len(pending_msgs)
         history = get_history_with_summary(db, conv.id, agent, len(pending_msgs))
         if history is None:
-            history = messages.get_history(db, conv.id, limit=fetch_limit)
+            history = messages.get_history(db, conv.id, limit=fetch_limit, include_meta=False)
             history = history[:-len(pending_msgs)]
             if len(history) > max_history:
                 history = history[-max_history:]
@@ -242,6 +246,7 @@ async def process_batched_messages(
             calendar_config=agent.calendar_config,
             user_appointments=user_appointments,
             agent=agent,
+            has_images=has_image_blocks,
         )
         
         # Update usage (cumulative JSON + daily table)
@@ -1,17 +1,31 @@
 """Appointment management service."""
+import asyncio
+import copy
+import hashlib
 import httpx
+import json
+from bisect import bisect_left, bisect_right
 from datetime import datetime, timedelta, time
+from functools import lru_cache
+from operator import itemgetter
+from time import monotonic
 from typing import Optional
 from zoneinfo import ZoneInfo
 
-from sqlalchemy.orm import Session
-from sqlalchemy.orm.attributes import flag_modified
+import redis.asyncio as aioredis
+from sqlalchemy import insert, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, load_only
+from sqlalchemy.orm.attributes import flag_modified, set_committed_value
 
+from backend.core.redis_client import get_redis
+from backend.core.database import SessionLocal
 from backend.models.appointment import Appointment
 from backend.models.agent import Agent
 from backend.models.conversation import Conversation
 from backend.services.scheduling import calendar
 from backend.core.logger import log, log_error
+from backend.core.timezone import UTC
 
 
 # Default working hours (Sunday=0, Monday=1, ..., Saturday=6)
@@ -54,8 +68,55 @@ def update_calendar_config(db: Session, agent: Agent, updates: dict) -> Agent:
     return agent
 
 
+def update_calendar_config_path(db: Session, agent: Agent, path: tuple[str, ...], value) -> None:
+    """Patch one key path inside calendar_config in place with jsonb_set.
+    
+    Only the patched sub-tree is sent; the in-memory config is updated to match
+    without dirtying the instance (no full-blob rewrite, no refresh SELECT).
+    """
+    db.execute(
+        text(
+            "UPDATE agents SET calendar_config = jsonb_set("
+            "COALESCE(calendar_config, '{}'::jsonb), :path, CAST(:value AS jsonb), true"
+            ") WHERE id = :id"
+        ),
+        {"path": list(path), "value": json.dumps(value), "id": agent.id},
+    )
+    
+    config = copy.deepcopy(agent.calendar_config or {})
+    node = config
+    for key in path[:-1]:
+        node = node.setdefault(key, {})
+    node[path[-1]] = value
+    db.commit()
+    set_committed_value(agent, "calendar_config", config)
+
+
 # --- Google Calendar Token Management ---
 
+# Access tokens are shared across workers via Redis so only one of them refreshes
+# an expiring token; the rest wait briefly for it (single-flight) and reuse it.
+_TOKEN_REFRESH_MARGIN = 300  # refresh when < 5 min left (matches calendar.get_valid_access_token)
+_TOKEN_LOCK_SECONDS = 30
+_TOKEN_WAIT_SECONDS = 5
+
+
+def _token_cache_key(agent_id: int, tokens: dict) -> str:
+    # Keyed by the refresh token too, so reconnecting another Google account
+    # never serves the previous account's access token
+    account = hashlib.sha256((tokens.get("refresh_token") or "").encode()).hexdigest()[:16]
+    return f"gcal:token:{agent_id}:{account}"
+
+
+async def _cache_token(r: Optional[aioredis.Redis], key: str, tokens: dict) -> None:
+    ttl = int(tokens.get("expires_at", 0) - datetime.utcnow().timestamp()) - _TOKEN_REFRESH_MARGIN
+    if r and ttl > 0:
+        try:
+            await r.set(key, tokens["access_token"], ex=ttl)
+        except Exception:
+            pass
+
+
 async def _get_google_token(db: Session, agent: Agent, config: dict) -> Optional[str]:
     """Get valid Google access token, auto-refreshing and saving if needed.
     
@@ -66,108 +127,280 @@ async def _get_google_token(db: Session, agent: Agent, config: dict) -> Optional
     if not tokens:
         return None
     
-    result = await calendar.get_valid_access_token(tokens)
-    if not result:
-        return None
-    
-    access_token, updated_tokens = result
-    
-    # Save updated tokens if they changed (refresh occurred)
-    if updated_tokens != tokens:
-        update_calendar_config(db, agent, {"google_tokens": updated_tokens})
+    r = await get_redis()
+    key = _token_cache_key(agent.id, tokens)
+    lock_key = f"{key}:lock"
+    locked = False
+    if r:
+        try:
+            cached = await r.get(key)
+            if cached:
+                return cached
+            if datetime.utcnow().timestamp() > tokens.get("expires_at", 0) - _TOKEN_REFRESH_MARGIN:
+                locked = bool(await r.set(lock_key, "1", nx=True, ex=_TOKEN_LOCK_SECONDS))
+                if not locked:
+                    # Another worker is refreshing — wait for its result
+                    for _ in range(_TOKEN_WAIT_SECONDS * 5):
+                        await asyncio.sleep(0.2)
+                        cached = await r.get(key)
+                        if cached:
+                            return cached
+        except Exception:
+            pass  # Redis trouble: fall back to refreshing locally
     
-    return access_token
+    try:
+        result = await calendar.get_valid_access_token(tokens)
+        if not result:
+            return None
+        
+        access_token, updated_tokens = result
+        
+        # Save updated tokens if they changed (refresh occurred)
+        if updated_tokens != tokens:
+            update_calendar_config_path(db, agent, ("google_tokens",), updated_tokens)
+        
+        await _cache_token(r, key, updated_tokens)
+        return access_token
+    finally:
+        if locked:
+            try:
+                await r.delete(lock_key)
+            except Exception:
+                pass
 
 
 # --- Availability Calculation ---
 
+# "HH:MM" label for every minute of the day, indexed by hour * 60 + minute
+_HHMM = tuple(f"{h:02d}:{m:02d}" for h in range(24) for m in range(60))
+
+
+_WEEKDAY_KEYS = frozenset("0123456")
+
+
+@lru_cache(maxsize=128)
+def _slot_template(hours_key: tuple[tuple[str, str, str], ...], duration: int) -> tuple[tuple[tuple[time, time], ...], ...]:
+    """Per-weekday slot times for a working-hours config, parsed once per config.
+    
+    Indexed by day of week, Sunday=0 (the working_hours key as an int).
+    """
+    template = [()] * 7
+    step = timedelta(minutes=duration)
+    for day_of_week, start, end in hours_key:
+        start_h, start_m = map(int, start.split(":"))
+        end_h, end_m = map(int, end.split(":"))
+        # Any date works here: slots never cross midnight
+        slot_start = datetime.combine(datetime.min.date(), time(start_h, start_m))
+        day_end = datetime.combine(datetime.min.date(), time(end_h, end_m))
+        slots = []
+        while slot_start + step <= day_end:
+            slots.append((slot_start.time(), (slot_start + step).time()))
+            slot_start += step
+        template[int(day_of_week)] = tuple(slots)
+    return tuple(template)
+
+
+def _working_hours_key(working_hours: dict) -> tuple[tuple[str, str, str], ...]:
+    return tuple(
+        (day, hours["start"], hours["end"])
+        for day, hours in sorted(working_hours.items()) if hours and day in _WEEKDAY_KEYS
+    )
+
+
+def _first_future_slot_index(day_template: tuple[tuple[time, time], ...], after: time) -> int:
+    """Index of the first slot starting strictly after `after` (slots are sorted)."""
+    return bisect_right(day_template, after, key=itemgetter(0))
+
+
 def _generate_day_slots(
     date: datetime.date,
-    working_hours: dict,
-    duration: int,
-    tz: ZoneInfo
+    template: tuple[tuple[tuple[time, time], ...], ...],
+    tz: ZoneInfo,
+    after: time | None = None
 ) -> list[tuple[datetime, datetime]]:
-    """Generate all possible time slots for a single day."""
-    day_of_week = str(date.isoweekday() % 7)  # Sunday=0
-    hours = working_hours.get(day_of_week)
-    
-    if not hours:
-        return []
-    
-    start_h, start_m = map(int, hours["start"].split(":"))
-    end_h, end_m = map(int, hours["end"].split(":"))
-    
-    slot_start = datetime.combine(date, time(start_h, start_m), tzinfo=tz)
-    day_end = datetime.combine(date, time(end_h, end_m), tzinfo=tz)
+    """Generate time slots for a single day from a _slot_template.
     
-    slots = []
-    while slot_start + timedelta(minutes=duration) <= day_end:
-        slot_end = slot_start + timedelta(minutes=duration)
-        slots.append((slot_start, slot_end))
-        slot_start = slot_end
-    
-    return slots
+    With `after`, slots starting at or before that time of day are skipped.
+    """
+    day_template = template[date.isoweekday() % 7]  # Sunday=0
+    if after is not None:
+        day_template = day_template[_first_future_slot_index(day_template, after):]
+    return [
+        (datetime.combine(date, start, tzinfo=tz), datetime.combine(date, end, tzinfo=tz))
+        for start, end in day_template
+    ]
 
 
-def _is_slot_available(
-    slot_start: datetime,
-    slot_end: datetime,
+def _merge_busy_times(
     busy_times: list[tuple[datetime, datetime]],
-    buffer: int,
-    tz: ZoneInfo
-) -> bool:
-    """Check if a slot conflicts with any busy time (including buffer)."""
-    from backend.core.timezone import UTC
+    buffer: int
+) -> tuple[list[datetime], list[datetime]]:
+    """Pad busy times by the buffer and merge overlaps into sorted, disjoint intervals.
     
-    for busy_start, busy_end in busy_times:
-        # Add buffer around busy times
-        busy_start_buffered = busy_start - timedelta(minutes=buffer)
-        busy_end_buffered = busy_end + timedelta(minutes=buffer)
-        
+    Returns parallel (starts, ends) lists; ends are increasing as well, so a
+    slot can be checked with one bisect instead of a scan over every busy time.
+    """
+    pad = timedelta(minutes=buffer)
+    starts: list[datetime] = []
+    ends: list[datetime] = []
+    intervals = sorted(
         # Ensure timezone awareness - DB stores UTC as naive datetime
-        if busy_start.tzinfo is None:
-            busy_start_buffered = busy_start_buffered.replace(tzinfo=UTC)
-            busy_end_buffered = busy_end_buffered.replace(tzinfo=UTC)
-        
-        # Check overlap
-        if not (slot_end <= busy_start_buffered or slot_start >= busy_end_buffered):
-            return False
+        ((busy_start if busy_start.tzinfo else busy_start.replace(tzinfo=UTC)) - pad,
+         (busy_end if busy_end.tzinfo else busy_end.replace(tzinfo=UTC)) + pad)
+        for busy_start, busy_end in busy_times
+    )
+    for busy_start, busy_end in intervals:
+        if ends and busy_start <= ends[-1]:
+            if busy_end > ends[-1]:
+                ends[-1] = busy_end
+        else:
+            starts.append(busy_start)
+            ends.append(busy_end)
+    return starts, ends
+
+
+def _free_slots(
+    day_slots: list[tuple[datetime, datetime]],
+    busy_starts: list[datetime],
+    busy_ends: list[datetime]
+) -> list[tuple[datetime, datetime]]:
+    """Filter a day's sorted slots down to those clear of every merged busy interval.
     
-    return True
+    One bisect places a cursor for the first slot, then slots and busy
+    intervals are walked together — O(log B + S + B) per day instead of a
+    bisect per slot.
+    """
+    if not day_slots:
+        return []
+    n = len(busy_starts)
+    j = bisect_left(busy_starts, day_slots[0][1])
+    free = []
+    for slot_start, slot_end in day_slots:
+        # busy_starts[:j] are the intervals starting before the slot ends
+        while j < n and busy_starts[j] < slot_end:
+            j += 1
+        # Slot ends are monotonic except across a spring-forward gap
+        while j and busy_starts[j - 1] >= slot_end:
+            j -= 1
+        # Last interval starting before the slot ends is the only one that can overlap
+        if j == 0 or busy_ends[j - 1] <= slot_start:
+            free.append((slot_start, slot_end))
+    return free
+
+
+# --- Google freeBusy cache ---
+
+# Short-lived per-agent cache of freeBusy results, so repeated availability
+# checks (and check -> book flows) skip the Google round trip. Entries cover
+# whole months to raise the hit rate; our own mutations invalidate them.
+_FREEBUSY_TTL_SECONDS = 120
+_FREEBUSY_MAX_ENTRIES = 1000
+_FREEBUSY_MAX_WINDOW = timedelta(days=62)
+_freebusy_cache: dict[tuple, tuple[float, list[tuple[datetime, datetime]]]] = {}
+
+
+def _freebusy_window(start_date: datetime, end_date: datetime) -> tuple[datetime, datetime]:
+    """Widen [start, end] to whole months (falls back to the exact range if too wide)."""
+    window_start = start_date.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    end_month = end_date.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    window_end = (end_month + timedelta(days=32)).replace(day=1)
+    if window_end - window_start > _FREEBUSY_MAX_WINDOW:
+        return start_date, end_date
+    return window_start, window_end
+
+
+async def _get_google_busy_times(
+    agent_id: int,
+    access_token: str,
+    config: dict,
+    start_date: datetime,
+    end_date: datetime
+) -> list[tuple[datetime, datetime]]:
+    """calendar.get_busy_times behind the per-agent TTL cache."""
+    window_start, window_end = _freebusy_window(start_date, end_date)
+    key = (agent_id, config["google_calendar_id"], window_start, window_end)
+    now = monotonic()
+    
+    cached = _freebusy_cache.get(key)
+    if cached and now - cached[0] < _FREEBUSY_TTL_SECONDS:
+        return cached[1]
+    
+    busy = await calendar.get_busy_times(
+        access_token,
+        config["google_calendar_id"],
+        window_start,
+        window_end,
+        config["timezone"]
+    )
+    
+    # get_busy_times returns [] on API errors too, so only cache real results
+    if busy:
+        if len(_freebusy_cache) >= _FREEBUSY_MAX_ENTRIES:
+            for k in [k for k, (ts, _) in _freebusy_cache.items() if now - ts >= _FREEBUSY_TTL_SECONDS]:
+                del _freebusy_cache[k]
+            while len(_freebusy_cache) >= _FREEBUSY_MAX_ENTRIES:
+                del _freebusy_cache[next(iter(_freebusy_cache))]
+        _freebusy_cache[key] = (now, busy)
+    return busy
+
+
+def invalidate_busy_times(agent_id: int) -> None:
+    """Drop cached freeBusy results for an agent after its calendar changes."""
+    for k in [k for k in _freebusy_cache if k[0] == agent_id]:
+        del _freebusy_cache[k]
+
+
+def _query_db_busy_times(
+    agent_id: int,
+    start_date: datetime,
+    end_date: datetime
+) -> list[tuple[datetime, datetime]]:
+    """Scheduled appointment intervals from the local DB.
+    
+    Runs in a worker thread, so it opens its own session — the caller's
+    session must not be shared across threads.
+    """
+    db = SessionLocal()
+    try:
+        # Only the two columns are needed — skip ORM hydration
+        rows = db.query(Appointment.start_time, Appointment.end_time).filter(
+            Appointment.agent_id == agent_id,
+            Appointment.status == "scheduled",
+            Appointment.start_time >= start_date,
+            Appointment.start_time <= end_date
+        ).all()
+        return [tuple(row) for row in rows]
+    finally:
+        db.close()
 
 
 async def _get_all_busy_times(
-    db: Session,
     agent: Agent,
     config: dict,
     start_date: datetime,
     end_date: datetime,
     access_token: Optional[str]
 ) -> list[tuple[datetime, datetime]]:
-    """Get busy times from both Google Calendar and local DB."""
-    busy_times = []
+    """Get busy times from both Google Calendar and local DB.
     
-    # From Google Calendar
-    if access_token:
-        google_busy = await calendar.get_busy_times(
-            access_token,
-            config["google_calendar_id"],
-            start_date,
-            end_date,
-            config["timezone"]
-        )
-        busy_times.extend(google_busy)
+    The freeBusy request and the DB query are independent, so they run
+    concurrently: latency is the slower of the two rather than their sum.
+    """
+    google_task = asyncio.create_task(
+        _get_google_busy_times(agent.id, access_token, config, start_date, end_date)
+    ) if access_token else None
     
     # From local DB (in case Google sync failed)
-    db_appointments = db.query(Appointment).filter(
-        Appointment.agent_id == agent.id,
-        Appointment.status == "scheduled",
-        Appointment.start_time >= start_date,
-        Appointment.start_time <= end_date
-    ).all()
+    try:
+        busy_times = await asyncio.to_thread(_query_db_busy_times, agent.id, start_date, end_date)
+    except BaseException:
+        if google_task:
+            google_task.cancel()
+        raise
     
-    for apt in db_appointments:
-        busy_times.append((apt.start_time, apt.end_time))
+    # From Google Calendar
+    if google_task:
+        busy_times.extend(await google_task)
     
     return busy_times
 
@@ -196,29 +429,36 @@ async def check_availability(
     
     # Collect all busy times
     busy_times = await _get_all_busy_times(
-        db, agent, config, start_date, end_date, access_token
+        agent, config, start_date, end_date, access_token
     )
     
+    busy_starts, busy_ends = _merge_busy_times(busy_times, buffer)
+    
     # Generate available slots
     available_slots = []
-    current_date = start_date.date()
+    today = now.date()
+    # Past days have no bookable slots — start from today at the earliest
+    current_date = max(start_date.date(), today)
     end_date_only = end_date.date()
     
+    template = _slot_template(_working_hours_key(working_hours), duration)
+    
     while current_date <= end_date_only:
-        day_slots = _generate_day_slots(current_date, working_hours, duration, tz)
+        # Today: skip past slots by index instead of building and discarding them
+        after = now.time() if current_date == today else None
+        day_slots = _generate_day_slots(current_date, template, tz, after)
+        
+        if not config.get("allow_double_booking"):
+            day_slots = _free_slots(day_slots, busy_starts, busy_ends)
         
+        date_str = current_date.isoformat()
         for slot_start, slot_end in day_slots:
-            # Skip past slots
-            if slot_start <= now:
-                continue
-            
-            if config.get("allow_double_booking") or _is_slot_available(slot_start, slot_end, busy_times, buffer, tz):
-                available_slots.append({
-                    "date": current_date.isoformat(),
-                    "start": slot_start.strftime("%H:%M"),
-                    "end": slot_end.strftime("%H:%M"),
-                    "datetime": slot_start.isoformat()
-                })
+            available_slots.append({
+                "date": date_str,
+                "start": _HHMM[slot_start.hour * 60 + slot_start.minute],
+                "end": _HHMM[slot_end.hour * 60 + slot_end.minute],
+                "datetime": slot_start.isoformat()
+            })
         
         current_date += timedelta(days=1)
     
@@ -227,6 +467,32 @@ async def check_availability(
 
 # --- Appointment CRUD ---
 
+def _is_overlap_violation(exc: Exception) -> bool:
+    """True if the DB rejected a write via ex_appointments_no_overlap (SQLSTATE 23P01)."""
+    return isinstance(exc, IntegrityError) and getattr(exc.orig, "pgcode", None) == "23P01"
+
+
+def _overlaps_exempt(
+    db: Session, agent_id: int, start_time: datetime, end_time: datetime, exclude_id: Optional[int] = None,
+) -> bool:
+    """True if a live allow_overlap appointment overlaps [start_time, end_time).
+    
+    ex_appointments_no_overlap ignores allow_overlap rows (booked while double-booking
+    was on, or flagged by the legacy back-fill), so with double-booking off they are
+    checked here. Uses ix_appointments_scheduled_busy.
+    """
+    query = db.query(Appointment.id).filter(
+        Appointment.agent_id == agent_id,
+        Appointment.status == "scheduled",
+        Appointment.allow_overlap == True,
+        Appointment.start_time < end_time,
+        Appointment.end_time > start_time,
+    )
+    if exclude_id is not None:
+        query = query.filter(Appointment.id != exclude_id)
+    return query.first() is not None
+
+
 async def book_appointment(
     db: Session,
     agent: Agent,
@@ -250,21 +516,37 @@ async def book_appointment(
     config = get_calendar_config(agent)
     end_time = start_time + timedelta(minutes=duration_minutes)
     
-    # Check for conflicts (skipped when allow_double_booking is enabled)
-    if not config.get("allow_double_booking"):
-        conflict = db.query(Appointment).filter(
-            Appointment.agent_id == agent.id,
-            Appointment.status == "scheduled",
-            Appointment.start_time < end_time,
-            Appointment.end_time > start_time
-        ).first()
-        
-        if conflict:
+    allow_overlap = bool(config.get("allow_double_booking"))
+    if not allow_overlap and _overlaps_exempt(db, agent.id, start_time, end_time):
+        log_error("appointments", "booking conflict")
+        return None
+    
+    # Claim the slot first: ex_appointments_no_overlap rejects overlapping bookings
+    # atomically in Postgres (rows booked under allow_double_booking are exempt)
+    try:
+        # INSERT ... RETURNING hands back the full row (ids, defaults) in one statement
+        appointment = db.execute(
+            insert(Appointment).values(
+                agent_id=agent.id,
+                user_id=user_id,
+                start_time=start_time,
+                end_time=end_time,
+                title=title,
+                description=description,
+                status="scheduled",
+                allow_overlap=allow_overlap,
+            ).returning(Appointment)
+        ).scalar_one()
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        if _is_overlap_violation(e):
             log_error("appointments", "booking conflict")
-            return None
+        else:
+            log_error("appointments", f"booking failed: {str(e)[:50]}")
+        return None
     
     # Create Google Calendar event if connected
-    google_event_id = None
     access_token = await _get_google_token(db, agent, config)
     
     if access_token:
@@ -282,30 +564,14 @@ async def book_appointment(
             reminder_minutes=reminder_minutes,
         )
         log("calendar", event_id=google_event_id)
+        if google_event_id:
+            appointment.google_event_id = google_event_id
+            db.commit()
     
-    # Create appointment in DB
-    appointment = Appointment(
-        agent_id=agent.id,
-        user_id=user_id,
-        google_event_id=google_event_id,
-        start_time=start_time,
-        end_time=end_time,
-        title=title,
-        description=description,
-        status="scheduled"
-    )
-    
-    try:
-        db.add(appointment)
-        db.commit()
-        db.refresh(appointment)
-    except Exception as e:
-        db.rollback()
-        log_error("appointments", f"booking failed: {str(e)[:50]}")
-        return None
+    invalidate_busy_times(agent.id)
     
-    # Send webhook
-    await send_webhook(agent, appointment, "appointment.created", db)
+    # Send webhook (background)
+    _queue_webhook(agent, appointment, "appointment.created")
     
     # Create scheduled reminders
     from backend.services.engagement.reminders import create_reminders_for_appointment
@@ -323,21 +589,32 @@ async def cancel_appointment(db: Session, appointment: Appointment, agent: Agent
     from backend.services.engagement.reminders import cancel_reminders_for_appointment
     cancel_reminders_for_appointment(db, appointment.id)
     
-    # Delete from Google Calendar if exists
-    if appointment.google_event_id:
-        access_token = await _get_google_token(db, agent, config)
-        if access_token:
-            await calendar.delete_event(
-                access_token,
-                config["google_calendar_id"],
-                appointment.google_event_id
-            )
-    
-    # Update status
+    access_token = await _get_google_token(db, agent, config) if appointment.google_event_id else None
+    
+    # Delete from Google Calendar (if exists) while the status update commits
+    google_task = asyncio.create_task(calendar.delete_event(
+        access_token,
+        config["google_calendar_id"],
+        appointment.google_event_id
+    )) if access_token else None
+    await asyncio.sleep(0)  # let the task send its request before the blocking DB work
+    
     appointment.status = "cancelled"
-    db.commit()
+    try:
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        # Google may already have dropped the event; the appointment stays
+        # scheduled in the DB and the caller sees the cancel as failed
+        log_error("appointments", f"cancel failed: {str(e)[:50]}")
+        return False
+    finally:
+        if google_task:
+            await google_task
     
-    await send_webhook(agent, appointment, "appointment.cancelled", db)
+    invalidate_busy_times(agent.id)
+    
+    _queue_webhook(agent, appointment, "appointment.cancelled")
     log("APPOINTMENT_CANCELLED", agent=agent.name, id=appointment.id)
     return True
 
@@ -355,46 +632,51 @@ async def reschedule_appointment(
     duration = new_duration_minutes or appointment.duration_minutes
     new_end_time = new_start_time + timedelta(minutes=duration)
     
-    # Check for conflicts (skipped when allow_double_booking is enabled)
-    if not config.get("allow_double_booking"):
-        conflict = db.query(Appointment).filter(
-            Appointment.agent_id == agent.id,
-            Appointment.status == "scheduled",
-            Appointment.id != appointment.id,
-            Appointment.start_time < new_end_time,
-            Appointment.end_time > new_start_time
-        ).first()
-        
-        if conflict:
-            return False
+    allow_overlap = bool(config.get("allow_double_booking"))
+    if not allow_overlap and _overlaps_exempt(db, agent.id, new_start_time, new_end_time, appointment.id):
+        return False
     
-    # Cancel old reminders
-    from backend.services.engagement.reminders import cancel_reminders_for_appointment, create_reminders_for_appointment
-    cancel_reminders_for_appointment(db, appointment.id)
-    
-    # Update Google Calendar if exists
-    if appointment.google_event_id:
-        access_token = await _get_google_token(db, agent, config)
-        if access_token:
-            await calendar.update_event(
-                access_token,
-                config["google_calendar_id"],
-                appointment.google_event_id,
-                start_time=new_start_time,
-                end_time=new_end_time,
-                timezone=config["timezone"]
-            )
-    
-    # Update in DB
+    # Move the slot first; ex_appointments_no_overlap rejects conflicts atomically
     appointment.start_time = new_start_time
     appointment.end_time = new_end_time
-    db.commit()
-    db.refresh(appointment)
+    appointment.allow_overlap = allow_overlap
+    try:
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        if not _is_overlap_violation(e):
+            log_error("appointments", f"reschedule failed: {str(e)[:50]}")
+        return False
+    
+    access_token = await _get_google_token(db, agent, config) if appointment.google_event_id else None
+    
+    # Update Google Calendar (if exists) while the reminders are replaced
+    google_task = asyncio.create_task(calendar.update_event(
+        access_token,
+        config["google_calendar_id"],
+        appointment.google_event_id,
+        start_time=new_start_time,
+        end_time=new_end_time,
+        timezone=config["timezone"]
+    )) if access_token else None
+    await asyncio.sleep(0)  # let the task send its request before the blocking DB work
+    
+    from backend.services.engagement.reminders import cancel_reminders_for_appointment, create_reminders_for_appointment
+    try:
+        cancel_reminders_for_appointment(db, appointment.id)
+        create_reminders_for_appointment(db, appointment, agent, appointment.user_id)
+    except Exception as e:
+        # The new time is already committed (and sent to Google), so the
+        # reschedule stands; the appointment may be left without reminders
+        db.rollback()
+        log_error("appointments", f"reminder update failed: {str(e)[:50]}")
+    finally:
+        if google_task:
+            await google_task
     
-    # Create new reminders
-    create_reminders_for_appointment(db, appointment, agent, appointment.user_id)
+    invalidate_busy_times(agent.id)
     
-    await send_webhook(agent, appointment, "appointment.updated", db)
+    _queue_webhook(agent, appointment, "appointment.updated")
     log("APPOINTMENT_RESCHEDULED", agent=agent.name, id=appointment.id)
     return True
 
@@ -407,8 +689,13 @@ def get_user_appointments(
     user_id: int,
     include_past: bool = False
 ) -> list[Appointment]:
-    """Get appointments for a specific user."""
-    query = db.query(Appointment).filter(
+    """Get appointments for a specific user.
+    
+    Loads only the display columns; other attributes lazy-load on access.
+    """
+    query = db.query(Appointment).options(
+        load_only(Appointment.id, Appointment.title, Appointment.start_time, Appointment.end_time)
+    ).filter(
         Appointment.agent_id == agent_id,
         Appointment.user_id == user_id,
         Appointment.status == "scheduled"
@@ -427,9 +714,39 @@ def get_appointment_by_id(db: Session, appointment_id: int) -> Optional[Appointm
 
 # --- Webhook ---
 
+# Customer webhook endpoints get their own pool, apart from the Google client.
+_webhook_client: httpx.AsyncClient | None = None
+
+
+def _get_webhook_client() -> httpx.AsyncClient:
+    global _webhook_client
+    if _webhook_client is None or _webhook_client.is_closed:
+        _webhook_client = httpx.AsyncClient(limits=httpx.Limits(max_connections=32, max_keepalive_connections=16))
+    return _webhook_client
+
+
+async def close_webhook_client() -> None:
+    """Close the webhook HTTP pool (called on app shutdown)."""
+    global _webhook_client
+    if _webhook_client is not None:
+        await _webhook_client.aclose()
+        _webhook_client = None
+
+# Summary generations in progress, keyed like uq_summary_per_message_window, so
+# webhooks for the same conversation firing together share one LLM call
+_summary_inflight: dict[tuple[int, Optional[datetime]], asyncio.Future] = {}
+
+
 async def _generate_appointment_summary(agent: Agent, appointment: Appointment, db: Session) -> str | None:
-    """Generate conversation summary for appointment webhook if summaries are enabled."""
-    from backend.services.engagement.summaries import get_summary_config, _get_conversation_text, _generate_summary
+    """Generate conversation summary for appointment webhook if summaries are enabled.
+    
+    Reuses a stored summary for the same message window, and concurrent calls
+    for one conversation await a single in-flight generation.
+    """
+    from backend.services.engagement.summaries import get_summary_config
+    from backend.models.conversation_summary import ConversationSummary
+    from backend.models.message import Message
+    from sqlalchemy import func
 
     summary_config = get_summary_config(agent)
     if not summary_config["enabled"]:
@@ -442,7 +759,48 @@ async def _generate_appointment_summary(agent: Agent, appointment: Appointment,
     if not conv:
         return None
 
-    conversation_text = _get_conversation_text(db, conv.id)
+    last_user_msg_time = db.query(func.max(Message.created_at)).filter(
+        Message.conversation_id == conv.id,
+        Message.role == "user"
+    ).scalar()
+
+    existing = db.query(ConversationSummary.summary_text).filter(
+        ConversationSummary.conversation_id == conv.id,
+        ConversationSummary.last_message_at == last_user_msg_time
+    ).first()
+    if existing:
+        return existing[0]
+
+    key = (conv.id, last_user_msg_time)
+    inflight = _summary_inflight.get(key)
+    if inflight:
+        return await asyncio.shield(inflight)
+
+    fut = asyncio.get_running_loop().create_future()
+    _summary_inflight[key] = fut
+    summary_text = None
+    try:
+        summary_text = await _create_appointment_summary(
+            agent, appointment, db, conv.id, last_user_msg_time, summary_config
+        )
+        return summary_text
+    finally:
+        fut.set_result(summary_text)
+        del _summary_inflight[key]
+
+
+async def _create_appointment_summary(
+    agent: Agent,
+    appointment: Appointment,
+    db: Session,
+    conversation_id: int,
+    last_user_msg_time: Optional[datetime],
+    summary_config: dict
+) -> str | None:
+    """Run the summary LLM and store the result (see _generate_appointment_summary)."""
+    from backend.services.engagement.summaries import _get_conversation_text, _generate_summary
+
+    conversation_text = _get_conversation_text(db, conversation_id)
     if not conversation_text:
         return None
 
@@ -464,19 +822,13 @@ async def _generate_appointment_summary(agent: Agent, appointment: Appointment,
     from backend.core.enums import SummaryWebhookStatus
     from backend.models.message import Message
     from sqlalchemy import func
-    from sqlalchemy.exc import IntegrityError
 
     msg_count = db.query(func.count(Message.id)).filter(
-        Message.conversation_id == conv.id
+        Message.conversation_id == conversation_id
     ).scalar() or 0
 
-    last_user_msg_time = db.query(func.max(Message.created_at)).filter(
-        Message.conversation_id == conv.id,
-        Message.role == "user"
-    ).scalar()
-
     record = ConversationSummary(
-        conversation_id=conv.id,
+        conversation_id=conversation_id,
         agent_id=agent.id,
         user_id=appointment.user_id,
         summary_text=summary_text,
@@ -497,6 +849,36 @@ async def _generate_appointment_summary(agent: Agent, appointment: Appointment,
     return summary_text
 
 
+# Strong refs to in-flight webhook tasks; the loop only keeps weak ones
+_webhook_tasks: set[asyncio.Task] = set()
+
+
+def _queue_webhook(agent: Agent, appointment: Appointment, event: str) -> None:
+    """Deliver the appointment webhook in the background, off the booking path.
+    
+    The summary LLM call and the POST can take seconds; callers only need the commit.
+    """
+    if not get_calendar_config(agent).get("webhook_url"):
+        return
+    task = asyncio.create_task(_send_webhook_bg(agent.id, appointment.id, event))
+    _webhook_tasks.add(task)
+    task.add_done_callback(_webhook_tasks.discard)
+
+
+async def _send_webhook_bg(agent_id: int, appointment_id: int, event: str) -> None:
+    """Background task: reload agent + appointment in a fresh session → send_webhook."""
+    db = SessionLocal()
+    try:
+        agent = db.get(Agent, agent_id)
+        appointment = db.get(Appointment, appointment_id)
+        if agent and appointment:
+            await send_webhook(agent, appointment, event, db)
+    except Exception as e:
+        log_error("webhook", f"appointment webhook task failed: {str(e)[:60]}")
+    finally:
+        db.close()
+
+
 async def send_webhook(agent: Agent, appointment: Appointment, event: str, db: Session) -> None:
     """Send webhook notification for appointment events."""
     config = get_calendar_config(agent)
@@ -546,7 +928,6 @@ async def send_webhook(agent: Agent, appointment: Appointment, event: str, db: S
     }
     
     try:
-        async with httpx.AsyncClient() as client:
-            await client.post(webhook_url, json=payload, timeout=15)
+        await _get_webhook_client().post(webhook_url, json=payload, timeout=15)
     except Exception as e:
         log_error("webhook", f"appointment webhook failed: {str(e)[:60]}")
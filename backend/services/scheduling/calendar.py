@@ -1,5 +1,6 @@
 """Google Calendar integration service."""
 import httpx
+import orjson
 from datetime import datetime, timedelta
 from typing import Optional
 from urllib.parse import urlencode
@@ -12,6 +13,28 @@ GOOGLE_AUTH_URL = "https://accounts.google.com/o/oauth2/v2/auth"
 GOOGLE_TOKEN_URL = "https://oauth2.googleapis.com/token"
 GOOGLE_CALENDAR_API = "https://www.googleapis.com/calendar/v3"
 
+# Shared pool for Google OAuth + Calendar calls, so repeated requests reuse
+# warm TLS connections instead of handshaking per call.
+_HTTP_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32)
+_HTTP_TIMEOUT = httpx.Timeout(15.0)
+_client: httpx.AsyncClient | None = None
+
+
+def _get_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(limits=_HTTP_LIMITS, timeout=_HTTP_TIMEOUT)
+    return _client
+
+
+async def close_client() -> None:
+    """Close the shared HTTP pool (called on app shutdown)."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
 # Scopes needed for calendar access
 SCOPES = [
     "https://www.googleapis.com/auth/calendar.readonly",
@@ -36,23 +59,22 @@ def get_oauth_url(redirect_uri: str, state: str) -> str:
 async def exchange_code_for_tokens(code: str, redirect_uri: str) -> Optional[dict]:
     """Exchange authorization code for access and refresh tokens."""
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                GOOGLE_TOKEN_URL,
-                data={
-                    "client_id": settings.google_client_id,
-                    "client_secret": settings.google_client_secret,
-                    "code": code,
-                    "grant_type": "authorization_code",
-                    "redirect_uri": redirect_uri,
-                },
-            )
+        response = await _get_client().post(
+            GOOGLE_TOKEN_URL,
+            data={
+                "client_id": settings.google_client_id,
+                "client_secret": settings.google_client_secret,
+                "code": code,
+                "grant_type": "authorization_code",
+                "redirect_uri": redirect_uri,
+            },
+        )
         
         if response.status_code != 200:
             log_error("calendar", f"token exchange failed: {response.text[:100]}")
             return None
         
-        data = response.json()
+        data = orjson.loads(response.content)
         return {
             "access_token": data["access_token"],
             "refresh_token": data.get("refresh_token"),
@@ -66,22 +88,21 @@ async def exchange_code_for_tokens(code: str, redirect_uri: str) -> Optional[dic
 async def refresh_access_token(refresh_token: str) -> Optional[dict]:
     """Refresh an expired access token."""
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                GOOGLE_TOKEN_URL,
-                data={
-                    "client_id": settings.google_client_id,
-                    "client_secret": settings.google_client_secret,
-                    "refresh_token": refresh_token,
-                    "grant_type": "refresh_token",
-                },
-            )
+        response = await _get_client().post(
+            GOOGLE_TOKEN_URL,
+            data={
+                "client_id": settings.google_client_id,
+                "client_secret": settings.google_client_secret,
+                "refresh_token": refresh_token,
+                "grant_type": "refresh_token",
+            },
+        )
         
         if response.status_code != 200:
             log_error("calendar", f"token refresh failed: {response.text[:100]}")
             return None
         
-        data = response.json()
+        data = orjson.loads(response.content)
         return {
             "access_token": data["access_token"],
             "refresh_token": refresh_token,  # Keep the same refresh token
@@ -116,17 +137,16 @@ async def get_valid_access_token(tokens: dict) -> Optional[tuple[str, dict]]:
 async def list_calendars(access_token: str) -> list[dict]:
     """List all calendars for the authenticated user."""
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{GOOGLE_CALENDAR_API}/users/me/calendarList",
-                headers={"Authorization": f"Bearer {access_token}"},
-            )
+        response = await _get_client().get(
+            f"{GOOGLE_CALENDAR_API}/users/me/calendarList",
+            headers={"Authorization": f"Bearer {access_token}"},
+        )
         
         if response.status_code != 200:
             log_error("calendar", f"list calendars failed: {response.text[:100]}")
             return []
         
-        data = response.json()
+        data = orjson.loads(response.content)
         return [
             {"id": cal["id"], "name": cal.get("summary", cal["id"]), "primary": cal.get("primary", False)}
             for cal in data.get("items", [])
@@ -158,26 +178,25 @@ async def get_busy_times(
             start_utc = start_time.replace(tzinfo=tz).astimezone(utc)
             end_utc = end_time.replace(tzinfo=tz).astimezone(utc)
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{GOOGLE_CALENDAR_API}/freeBusy",
-                headers={
-                    "Authorization": f"Bearer {access_token}",
-                    "Content-Type": "application/json",
-                },
-                json={
-                    "timeMin": start_utc.strftime("%Y-%m-%dT%H:%M:%SZ"),
-                    "timeMax": end_utc.strftime("%Y-%m-%dT%H:%M:%SZ"),
-                    "timeZone": timezone,
-                    "items": [{"id": calendar_id}],
-                },
-            )
+        response = await _get_client().post(
+            f"{GOOGLE_CALENDAR_API}/freeBusy",
+            headers={
+                "Authorization": f"Bearer {access_token}",
+                "Content-Type": "application/json",
+            },
+            json={
+                "timeMin": start_utc.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "timeMax": end_utc.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "timeZone": timezone,
+                "items": [{"id": calendar_id}],
+            },
+        )
         
         if response.status_code != 200:
             log_error("calendar", f"freeBusy failed: {response.text[:100]}")
             return []
         
-        data = response.json()
+        data = orjson.loads(response.content)
         busy_slots = data.get("calendars", {}).get(calendar_id, {}).get("busy", [])
         
         return [
@@ -257,22 +276,21 @@ async def create_event(
         if add_meet_link:
             params["conferenceDataVersion"] = 1
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{GOOGLE_CALENDAR_API}/calendars/{calendar_id}/events",
-                headers={
-                    "Authorization": f"Bearer {access_token}",
-                    "Content-Type": "application/json",
-                },
-                params=params or None,
-                json=body,
-            )
+        response = await _get_client().post(
+            f"{GOOGLE_CALENDAR_API}/calendars/{calendar_id}/events",
+            headers={
+                "Authorization": f"Bearer {access_token}",
+                "Content-Type": "application/json",
+            },
+            params=params or None,
+            json=body,
+        )
 
         if response.status_code not in (200, 201):
             log_error("calendar", f"create event failed: {response.text[:100]}")
             return None
 
-        data = response.json()
+        data = orjson.loads(response.content)
         return data.get("id")
     except Exception as e:
         log_error("calendar", f"create event error: {str(e)[:80]}")
@@ -289,40 +307,29 @@ async def update_event(
     description: str = None,
     timezone: str = "Asia/Jerusalem"
 ) -> bool:
-    """Update a calendar event."""
+    """Update a calendar event.
+    
+    Sends only the changed fields with PATCH — one round trip, no read-modify-write.
+    """
     try:
-        # First get the existing event
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{GOOGLE_CALENDAR_API}/calendars/{calendar_id}/events/{event_id}",
-                headers={"Authorization": f"Bearer {access_token}"},
-            )
-        
-        if response.status_code != 200:
-            return False
-        
-        event = response.json()
-        
-        # Update fields
+        patch: dict = {}
         if title:
-            event["summary"] = title
+            patch["summary"] = title
         if description is not None:
-            event["description"] = description
+            patch["description"] = description
         if start_time:
-            event["start"] = {"dateTime": start_time.isoformat(), "timeZone": timezone}
+            patch["start"] = {"dateTime": start_time.isoformat(), "timeZone": timezone}
         if end_time:
-            event["end"] = {"dateTime": end_time.isoformat(), "timeZone": timezone}
+            patch["end"] = {"dateTime": end_time.isoformat(), "timeZone": timezone}
         
-        # Save
-        async with httpx.AsyncClient() as client:
-            response = await client.put(
-                f"{GOOGLE_CALENDAR_API}/calendars/{calendar_id}/events/{event_id}",
-                headers={
-                    "Authorization": f"Bearer {access_token}",
-                    "Content-Type": "application/json",
-                },
-                json=event,
-            )
+        response = await _get_client().patch(
+            f"{GOOGLE_CALENDAR_API}/calendars/{calendar_id}/events/{event_id}",
+            headers={
+                "Authorization": f"Bearer {access_token}",
+                "Content-Type": "application/json",
+            },
+            json=patch,
+        )
         
         return response.status_code == 200
     except Exception as e:
@@ -333,11 +340,10 @@ async def update_event(
 async def delete_event(access_token: str, calendar_id: str, event_id: str) -> bool:
     """Delete a calendar event."""
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.delete(
-                f"{GOOGLE_CALENDAR_API}/calendars/{calendar_id}/events/{event_id}",
-                headers={"Authorization": f"Bearer {access_token}"},
-            )
+        response = await _get_client().delete(
+            f"{GOOGLE_CALENDAR_API}/calendars/{calendar_id}/events/{event_id}",
+            headers={"Authorization": f"Bearer {access_token}"},
+        )
         
         return response.status_code in (200, 204)
     except Exception as e: